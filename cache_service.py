@@ -11,15 +11,18 @@ import json
 class CacheService:
     """In-memory cache with TTL support"""
 
-    def __init__(self, default_ttl: int = 300):
+    def __init__(self, default_ttl: int = 300, max_entries: Optional[int] = None):
         """
         Initialize cache service
 
         Args:
             default_ttl: Default time-to-live in seconds (default: 5 minutes)
+            max_entries: Optional cap on stored entries; the least recently
+                written entry is evicted first (default: unbounded)
         """
         self.cache: Dict[str, Dict[str, Any]] = {}
         self.default_ttl = default_ttl
+        self.max_entries = max_entries
 
     def _generate_key(self, *args, **kwargs) -> str:
         """Generate cache key from arguments"""
@@ -59,6 +62,11 @@ class CacheService:
         """
         ttl = ttl if ttl is not None else self.default_ttl
 
+        # Re-insert so dict order tracks write recency for eviction
+        self.cache.pop(key, None)
+        if self.max_entries is not None and len(self.cache) >= self.max_entries:
+            del self.cache[next(iter(self.cache))]
+
         self.cache[key] = {
             'value': value,
             'expires_at': time.time() + ttl,
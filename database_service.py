@@ -4,9 +4,16 @@ Handles PostgreSQL connections and queries
 """
 
 import asyncpg
-from typing import Optional, Dict, Any, List
+import logging
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
 import os
 import math
+import json
+from datetime import datetime, timedelta, timezone
+
+from cache_service import CacheService
+
+logger = logging.getLogger(__name__)
 
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -40,22 +47,555 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return distance
 
 
+# Rate columns that can be substituted into the market queries below.
+# Column names can't be bind parameters, so each template that uses
+# {rate_column} is rendered once per column when the service is created; the
+# rest are rendered once, under rate_column None. Everything else that varies
+# per call (profession, percentile, sort direction) is passed as a bind
+# parameter, which keeps the SQL text stable and lets asyncpg reuse its
+# prepared statements.
+RATE_COLUMNS = ('"hourlyPay"', '"weeklyPay"', '"billRate"')
+
+METERS_PER_MILE = 1609.344
+
+# Column-name prefix for each rate column in vmsraw_market_percentiles
+RATE_PREFIXES = {'"hourlyPay"': 'hourly', '"weeklyPay"': 'weekly', '"billRate"': 'bill'}
+
+# Columns returned for each job by the nearby-job searches, alongside the
+# selected rate column and the computed distance_miles
+NEARBY_JOB_COLUMNS = '"clientName", city, state, "newSpecialty", "newProfession", "startDate", "shiftType", vms'
+
+# Specialties stored under several names in "newSpecialty", keyed by the
+# upper-cased user input. Anything not listed gets a word-boundary pattern.
+SPECIALTY_PATTERNS: Dict[str, str] = {
+    # "APRN - CRNA", "Certified Nurse Anesthetist (CRNA)" or just "CRNA"
+    "CRNA": "(APRN - CRNA|Certified Nurse Anesthetist|\\bCRNA\\b)",
+    "CERTIFIED NURSE ANESTHETIST": "(APRN - CRNA|Certified Nurse Anesthetist|\\bCRNA\\b)",
+}
+
+QUERY_TEMPLATES: Dict[str, str] = {
+    # $1 specialty pattern, $2 city, $3 state, $4 floor percentile, $5 profession
+    'rate_recommendation_city': """
+        SELECT
+            "newSpecialty" as specialty,
+            city,
+            state as location,
+            AVG({rate_column}) * 0.975 as recommended_min,
+            AVG({rate_column}) * 1.025 as recommended_max,
+            PERCENTILE_CONT($4::float8) WITHIN GROUP (ORDER BY {rate_column}) as competitive_floor,
+            AVG({rate_column}) as market_average,
+            AVG("weeklyPay") as avg_weekly_pay,
+            AVG("hourlyPay") as avg_hourly_pay,
+            AVG("billRate") as avg_bill_rate,
+            COUNT(*) as sample_size
+        FROM vmsrawscrape_prod
+        WHERE "newSpecialty" ~ $1
+            AND LOWER(city) = LOWER($2)
+            AND LOWER(state) = LOWER($3)
+            AND {rate_column} IS NOT NULL
+            AND "billRate" BETWEEN 30 AND 800
+            AND "weeklyPay" BETWEEN 1200 AND 15000
+            AND "hourlyPay" BETWEEN 10 AND 250
+            AND "startDate" >= NOW() - INTERVAL '3 months'
+            AND ($5::text IS NULL OR "newProfession" = $5)
+        GROUP BY "newSpecialty", city, state
+        HAVING COUNT(*) >= 5
+        ORDER BY COUNT(*) DESC
+        LIMIT 1
+    """,
+    # $1 specialty pattern, $2 state, $3 floor percentile, $4 profession
+    'rate_recommendation_state': """
+        SELECT
+            "newSpecialty" as specialty,
+            state as location,
+            AVG({rate_column}) * 0.975 as recommended_min,
+            AVG({rate_column}) * 1.025 as recommended_max,
+            PERCENTILE_CONT($3::float8) WITHIN GROUP (ORDER BY {rate_column}) as competitive_floor,
+            AVG({rate_column}) as market_average,
+            AVG("weeklyPay") as avg_weekly_pay,
+            AVG("hourlyPay") as avg_hourly_pay,
+            AVG("billRate") as avg_bill_rate,
+            COUNT(*) as sample_size
+        FROM vmsrawscrape_prod
+        WHERE "newSpecialty" ~ $1
+            AND LOWER(state) = LOWER($2)
+            AND {rate_column} IS NOT NULL
+            AND "billRate" BETWEEN 30 AND 800
+            AND "weeklyPay" BETWEEN 1200 AND 15000
+            AND "hourlyPay" BETWEEN 10 AND 250
+            AND "startDate" >= NOW() - INTERVAL '3 months'
+            AND ($4::text IS NULL OR "newProfession" = $4)
+        GROUP BY "newSpecialty", state
+        ORDER BY COUNT(*) DESC
+        LIMIT 1
+    """,
+    # $1 specialty pattern, $2 floor percentile, $3 profession
+    'rate_recommendation_national': """
+        SELECT
+            "newSpecialty" as specialty,
+            'National' as location,
+            AVG({rate_column}) * 0.975 as recommended_min,
+            AVG({rate_column}) * 1.025 as recommended_max,
+            PERCENTILE_CONT($2::float8) WITHIN GROUP (ORDER BY {rate_column}) as competitive_floor,
+            AVG({rate_column}) as market_average,
+            AVG("weeklyPay") as avg_weekly_pay,
+            AVG("hourlyPay") as avg_hourly_pay,
+            AVG("billRate") as avg_bill_rate,
+            COUNT(*) as sample_size
+        FROM vmsrawscrape_prod
+        WHERE "newSpecialty" ~ $1
+            AND {rate_column} IS NOT NULL
+            AND "billRate" BETWEEN 30 AND 800
+            AND "weeklyPay" BETWEEN 1200 AND 15000
+            AND "hourlyPay" BETWEEN 10 AND 250
+            AND "startDate" >= NOW() - INTERVAL '3 months'
+            AND ($3::text IS NULL OR "newProfession" = $3)
+        GROUP BY "newSpecialty"
+        HAVING COUNT(*) >= 5
+    """,
+    # Ranked client queries take a sort sign as their last parameter:
+    # 1 orders highest rates first, -1 orders lowest rates first.
+    # The client queries need no DISTINCT: GROUP BY already yields one row
+    # per client/location/specialty, and ORDER BY ... LIMIT is a top-N sort.
+    # $1 specialty, $2 state, $3 sort sign
+    'clients_ranked_specialty_location': """
+        SELECT
+            "clientName" as client_name,
+            city,
+            state,
+            specialty,
+            AVG({rate_column}) as avg_rate,
+            COUNT(*) as assignment_count,
+            MAX("startDate") as most_recent
+        FROM vmsrawscrape_prod
+        WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
+            AND LOWER(state) = LOWER($2)
+            AND {rate_column} IS NOT NULL
+            AND "billRate" BETWEEN 30 AND 800
+            AND "weeklyPay" BETWEEN 1200 AND 15000
+            AND "hourlyPay" BETWEEN 10 AND 250
+            AND "startDate" >= CURRENT_DATE
+            AND "clientName" IS NOT NULL
+        GROUP BY "clientName", city, state, specialty
+        ORDER BY AVG({rate_column}) * $3 DESC
+        LIMIT 15
+    """,
+    # $1 specialty, $2 sort sign
+    'clients_ranked_specialty': """
+        SELECT
+            "clientName" as client_name,
+            city,
+            state,
+            specialty,
+            AVG({rate_column}) as avg_rate,
+            COUNT(*) as assignment_count,
+            MAX("startDate") as most_recent
+        FROM vmsrawscrape_prod
+        WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
+            AND {rate_column} IS NOT NULL
+            AND "billRate" BETWEEN 30 AND 800
+            AND "weeklyPay" BETWEEN 1200 AND 15000
+            AND "hourlyPay" BETWEEN 10 AND 250
+            AND "startDate" >= CURRENT_DATE
+            AND "clientName" IS NOT NULL
+        GROUP BY "clientName", city, state, specialty
+        ORDER BY AVG({rate_column}) * $2 DESC
+        LIMIT 15
+    """,
+    # $1 state, $2 sort sign
+    'clients_ranked_location': """
+        SELECT
+            "clientName" as client_name,
+            city,
+            state,
+            specialty,
+            AVG({rate_column}) as avg_rate,
+            COUNT(*) as assignment_count,
+            MAX("startDate") as most_recent
+        FROM vmsrawscrape_prod
+        WHERE LOWER(state) = LOWER($1)
+            AND {rate_column} IS NOT NULL
+            AND "billRate" BETWEEN 30 AND 800
+            AND "weeklyPay" BETWEEN 1200 AND 15000
+            AND "hourlyPay" BETWEEN 10 AND 250
+            AND "startDate" >= CURRENT_DATE
+            AND "clientName" IS NOT NULL
+        GROUP BY "clientName", city, state, specialty
+        ORDER BY AVG({rate_column}) * $2 DESC
+        LIMIT 15
+    """,
+    # $1 specialty, $2 state (NULL for all states)
+    'clients_market_average': """
+        SELECT AVG({rate_column}) as avg_rate
+        FROM vmsrawscrape_prod
+        WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
+            AND {rate_column} IS NOT NULL
+            AND "startDate" >= CURRENT_DATE
+            AND "billRate" BETWEEN 30 AND 800
+            AND "weeklyPay" BETWEEN 1200 AND 15000
+            AND "hourlyPay" BETWEEN 10 AND 250
+            AND ($2::text IS NULL OR LOWER(state) = LOWER($2))
+    """,
+    # $1 specialty, $2 state, $3 min rate, $4 max rate
+    'clients_similar_specialty_location': """
+        SELECT
+            "clientName" as client_name,
+            city,
+            state,
+            specialty,
+            AVG({rate_column}) as avg_rate,
+            COUNT(*) as assignment_count,
+            MAX("startDate") as most_recent
+        FROM vmsrawscrape_prod
+        WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
+            AND LOWER(state) = LOWER($2)
+            AND {rate_column} BETWEEN $3 AND $4
+            AND {rate_column} IS NOT NULL
+            AND "startDate" >= CURRENT_DATE
+            AND "billRate" BETWEEN 30 AND 800
+            AND "weeklyPay" BETWEEN 1200 AND 15000
+            AND "hourlyPay" BETWEEN 10 AND 250
+            AND "clientName" IS NOT NULL
+        GROUP BY "clientName", city, state, specialty
+        ORDER BY assignment_count DESC, avg_rate DESC
+        LIMIT 15
+    """,
+    # $1 specialty, $2 min rate, $3 max rate
+    'clients_similar_specialty': """
+        SELECT
+            "clientName" as client_name,
+            city,
+            state,
+            specialty,
+            AVG({rate_column}) as avg_rate,
+            COUNT(*) as assignment_count,
+            MAX("startDate") as most_recent
+        FROM vmsrawscrape_prod
+        WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
+            AND {rate_column} BETWEEN $2 AND $3
+            AND {rate_column} IS NOT NULL
+            AND "startDate" >= CURRENT_DATE
+            AND "billRate" BETWEEN 30 AND 800
+            AND "weeklyPay" BETWEEN 1200 AND 15000
+            AND "hourlyPay" BETWEEN 10 AND 250
+            AND "clientName" IS NOT NULL
+        GROUP BY "clientName", city, state, specialty
+        ORDER BY assignment_count DESC, avg_rate DESC
+        LIMIT 15
+    """,
+    # $1 specialty, $2 city, $3 state, $4 min rate, $5 max rate
+    'comparable_jobs_city': """
+        SELECT
+            specialty,
+            "clientName" as client_name,
+            city,
+            state,
+            "startDate" as start_date,
+            "weeklyPay" as weekly_pay,
+            "hourlyPay" as hourly_pay,
+            "billRate" as bill_rate
+        FROM vmsrawscrape_prod
+        WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
+            AND LOWER(city) = LOWER($2)
+            AND LOWER(state) = LOWER($3)
+            AND {rate_column} BETWEEN $4 AND $5
+            AND {rate_column} IS NOT NULL
+            AND "startDate" >= CURRENT_DATE
+            AND "billRate" BETWEEN 30 AND 800
+            AND "weeklyPay" BETWEEN 1200 AND 15000
+            AND "hourlyPay" BETWEEN 10 AND 250
+            AND "clientName" IS NOT NULL
+        ORDER BY "startDate" ASC
+        LIMIT 20
+    """,
+    # $1 specialty, $2 state, $3 min rate, $4 max rate
+    'comparable_jobs_state': """
+        SELECT
+            specialty,
+            "clientName" as client_name,
+            city,
+            state,
+            "startDate" as start_date,
+            "weeklyPay" as weekly_pay,
+            "hourlyPay" as hourly_pay,
+            "billRate" as bill_rate
+        FROM vmsrawscrape_prod
+        WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
+            AND LOWER(state) = LOWER($2)
+            AND {rate_column} BETWEEN $3 AND $4
+            AND {rate_column} IS NOT NULL
+            AND "startDate" >= CURRENT_DATE
+            AND "billRate" BETWEEN 30 AND 800
+            AND "weeklyPay" BETWEEN 1200 AND 15000
+            AND "hourlyPay" BETWEEN 10 AND 250
+            AND "clientName" IS NOT NULL
+        ORDER BY "startDate" ASC
+        LIMIT 20
+    """,
+    # One fixed statement for every filter combination; filters that were
+    # not supplied are passed as NULL and short-circuit.
+    # $1 client name ILIKE pattern, $2 city, $3 state, $4 specialty (NULL for any)
+    'vendors_at_location': """
+        SELECT
+            "vendorName" as vendor_name,
+            "clientName" as client_name,
+            city,
+            state,
+            specialty,
+            COUNT(*) as assignment_count,
+            AVG("billRate") as avg_bill_rate,
+            AVG("hourlyPay") as avg_hourly_pay,
+            AVG("weeklyPay") as avg_weekly_pay,
+            MAX("startDate") as most_recent
+        FROM vmsrawscrape_prod
+        WHERE "clientName" ILIKE $1
+            AND ($2::text IS NULL OR LOWER(city) = LOWER($2))
+            AND ($3::text IS NULL OR LOWER(state) = LOWER($3))
+            AND ($4::text IS NULL OR specialty ~ ('(^|\\s|-)' || $4 || '($|\\s)'))
+            AND "vendorName" IS NOT NULL
+            AND "startDate" >= NOW() - INTERVAL '6 months'
+            AND "billRate" BETWEEN 30 AND 800
+            AND "weeklyPay" BETWEEN 1200 AND 15000
+            AND "hourlyPay" BETWEEN 10 AND 250
+        GROUP BY "vendorName", "clientName", city, state, specialty
+        ORDER BY assignment_count DESC, most_recent DESC
+        LIMIT 20
+    """,
+    # Market percentiles for all three rate columns in one pass (same column
+    # names as vmsraw_market_percentiles); callers pick the prefix they need.
+    # The pay-range bounds already exclude NULL rates.
+    # $1 specialty, $2 city, $3 state
+    'highest_rates_city': """
+        SELECT
+            PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY "billRate") as bill_p75,
+            PERCENTILE_CONT(0.90) WITHIN GROUP (ORDER BY "billRate") as bill_p90,
+            MAX("billRate") as bill_max,
+            AVG("billRate") as bill_avg,
+            PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY "hourlyPay") as hourly_p75,
+            PERCENTILE_CONT(0.90) WITHIN GROUP (ORDER BY "hourlyPay") as hourly_p90,
+            MAX("hourlyPay") as hourly_max,
+            AVG("hourlyPay") as hourly_avg,
+            PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY "weeklyPay") as weekly_p75,
+            PERCENTILE_CONT(0.90) WITHIN GROUP (ORDER BY "weeklyPay") as weekly_p90,
+            MAX("weeklyPay") as weekly_max,
+            AVG("weeklyPay") as weekly_avg,
+            COUNT(*) as sample_size
+        FROM vmsrawscrape_prod
+        WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
+            AND LOWER(city) = LOWER($2)
+            AND LOWER(state) = LOWER($3)
+            AND "startDate" >= NOW() - INTERVAL '3 months'
+            AND "billRate" BETWEEN 30 AND 800
+            AND "weeklyPay" BETWEEN 1200 AND 15000
+            AND "hourlyPay" BETWEEN 10 AND 250
+        HAVING COUNT(*) >= 5
+    """,
+    # $1 specialty, $2 state
+    'highest_rates_state': """
+        SELECT
+            PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY "billRate") as bill_p75,
+            PERCENTILE_CONT(0.90) WITHIN GROUP (ORDER BY "billRate") as bill_p90,
+            MAX("billRate") as bill_max,
+            AVG("billRate") as bill_avg,
+            PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY "hourlyPay") as hourly_p75,
+            PERCENTILE_CONT(0.90) WITHIN GROUP (ORDER BY "hourlyPay") as hourly_p90,
+            MAX("hourlyPay") as hourly_max,
+            AVG("hourlyPay") as hourly_avg,
+            PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY "weeklyPay") as weekly_p75,
+            PERCENTILE_CONT(0.90) WITHIN GROUP (ORDER BY "weeklyPay") as weekly_p90,
+            MAX("weeklyPay") as weekly_max,
+            AVG("weeklyPay") as weekly_avg,
+            COUNT(*) as sample_size
+        FROM vmsrawscrape_prod
+        WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
+            AND LOWER(state) = LOWER($2)
+            AND "startDate" >= NOW() - INTERVAL '3 months'
+            AND "billRate" BETWEEN 30 AND 800
+            AND "weeklyPay" BETWEEN 1200 AND 15000
+            AND "hourlyPay" BETWEEN 10 AND 250
+        GROUP BY specialty
+    """,
+    # Point lookup against the precomputed percentiles (pgSqlUpdates/MarketPercentiles).
+    # highest_rates_city pools every specialty matching the token, so a city
+    # row is only served when no other specialty there matches it.
+    # $1 specialty, $2 city (NULL for the state-wide row), $3 state
+    'market_percentiles_lookup': """
+        SELECT p.*
+        FROM vmsraw_market_percentiles p
+        WHERE p.specialty = $1
+            AND p.state = LOWER($3)
+            AND (($2::text IS NULL AND p.scope = 'state')
+                OR (p.scope = 'city' AND p.city = LOWER($2) AND p.sample_size >= 5
+                    AND NOT EXISTS (
+                        SELECT 1
+                        FROM vmsraw_market_percentiles o
+                        WHERE o.state = p.state
+                            AND o.scope = 'city'
+                            AND o.city = p.city
+                            AND o.specialty <> p.specialty
+                            AND o.specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)'))))
+    """,
+    # Top 3 vendors (by parentOrg) for each requested client, in one pass.
+    # $1 client name fragments (text[]), $2 city (NULL for any), $3 state (NULL for any)
+    'vendors_for_clients': """
+        WITH requested AS (
+            SELECT name, idx
+            FROM unnest($1::text[]) WITH ORDINALITY AS r(name, idx)
+        ),
+        matched AS (
+            SELECT r.idx, p."parentOrg"
+            FROM requested r
+            JOIN vmsrawscrape_prod p ON p."clientName" ILIKE '%' || r.name || '%'
+            WHERE ($2::text IS NULL OR p.city ILIKE '%' || $2 || '%')
+                AND ($3::text IS NULL OR p.state ILIKE '%' || $3 || '%')
+                AND p."startDate" >= CURRENT_DATE
+        ),
+        vendor_counts AS (
+            SELECT
+                idx,
+                "parentOrg" as vendor_name,
+                COUNT(*) as vms_count,
+                ROW_NUMBER() OVER (PARTITION BY idx ORDER BY COUNT(*) DESC) as rn
+            FROM matched
+            WHERE "parentOrg" IS NOT NULL
+                AND TRIM("parentOrg") != ''
+            GROUP BY idx, "parentOrg"
+        ),
+        totals AS (
+            SELECT idx, COUNT(*) as total_jobs
+            FROM matched
+            GROUP BY idx
+        )
+        SELECT
+            v.idx,
+            t.total_jobs,
+            v.vendor_name,
+            v.vms_count,
+            ROUND((v.vms_count::numeric / t.total_jobs::numeric) * 100, 1) as percentage
+        FROM vendor_counts v
+        JOIN totals t ON t.idx = v.idx
+        WHERE v.rn <= 3
+        ORDER BY v.idx, v.vms_count DESC
+    """,
+    # $1 specialty pattern, $2 limit, $3 direction sign (1 rising, -1 falling),
+    # $4 profession
+    'rate_trends_by_state': """
+        WITH recent_rates AS (
+            SELECT
+                state,
+                AVG({rate_column}) as avg_rate,
+                COUNT(*) as sample_size
+            FROM vmsrawscrape_prod
+            WHERE "newSpecialty" ~ $1
+                AND {rate_column} IS NOT NULL
+                AND "billRate" BETWEEN 30 AND 800
+                AND "weeklyPay" BETWEEN 1200 AND 15000
+                AND "hourlyPay" BETWEEN 10 AND 250
+                AND "startDate" >= NOW() - INTERVAL '30 days'
+                AND ($4::text IS NULL OR "newProfession" = $4)
+            GROUP BY state
+            HAVING COUNT(*) >= 2
+        ),
+        older_rates AS (
+            SELECT
+                state,
+                AVG({rate_column}) as avg_rate,
+                COUNT(*) as sample_size
+            FROM vmsrawscrape_prod
+            WHERE "newSpecialty" ~ $1
+                AND {rate_column} IS NOT NULL
+                AND "billRate" BETWEEN 30 AND 800
+                AND "weeklyPay" BETWEEN 1200 AND 15000
+                AND "hourlyPay" BETWEEN 10 AND 250
+                AND "startDate" >= NOW() - INTERVAL '90 days'
+                AND "startDate" < NOW() - INTERVAL '30 days'
+                AND ($4::text IS NULL OR "newProfession" = $4)
+            GROUP BY state
+            HAVING COUNT(*) >= 2
+        )
+        SELECT *
+        FROM (
+            SELECT
+                r.state,
+                r.avg_rate as recent_rate,
+                o.avg_rate as older_rate,
+                (r.avg_rate - o.avg_rate) / o.avg_rate * 100 as percent_change,
+                r.sample_size as recent_sample_size,
+                o.sample_size as older_sample_size
+            FROM recent_rates r
+            JOIN older_rates o ON r.state = o.state
+            -- At least a 1% move in the requested direction, without dividing
+            -- (older rates are always positive given the pay bounds)
+            WHERE (r.avg_rate - o.avg_rate) * $3 >= o.avg_rate * 0.01
+        ) trends
+        ORDER BY percent_change * $3 DESC
+        LIMIT $2
+    """,
+}
+
+
+# Queries whose rows go back to callers unchanged. They are also rendered
+# wrapped in json_agg so Postgres builds the row objects (see fetch_json_rows);
+# json_agg keeps the ORDER BY of the sorted subquery it reads from.
+JSON_ROW_QUERIES = (
+    'clients_ranked_specialty_location',
+    'clients_ranked_specialty',
+    'clients_ranked_location',
+    'clients_similar_specialty_location',
+    'clients_similar_specialty',
+    'vendors_at_location',
+)
+
+
 class DatabaseService:
     """Service for interacting with PostgreSQL database"""
 
-    def __init__(self, host: str, user: str, password: str, database: str, port: int = 5432):
+    def __init__(self, host: str, user: str, password: str, database: str, port: int = 5432,
+                 pool_min_size: int = 4, pool_max_size: int = 20, statement_cache_size: int = 256):
         self.host = host
         self.user = user
         self.password = password
         self.database = database
         self.port = port
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        # Per-connection prepared statement cache; must hold every rendered
+        # template (plus JSON variants and nearby-job shapes) to stay warm
+        self.statement_cache_size = statement_cache_size
         self.pool: Optional[asyncpg.Pool] = None
 
-    def _get_profession_filter(self, profession: Optional[str]) -> str:
-        """Generate SQL WHERE clause for profession filtering"""
-        if profession:
-            return f' AND "newProfession" = \'{profession}\''
-        return ''
+        # Render every query template once per rate column it can take so each
+        # call reuses the exact same SQL text (and asyncpg's prepared statement)
+        self._stmt_cache: Dict[tuple, str] = {
+            (name, rate_column): template.format(rate_column=rate_column)
+            for name, template in QUERY_TEMPLATES.items()
+            for rate_column in (RATE_COLUMNS if '{rate_column}' in template else (None,))
+        }
+        self._json_stmt_cache: Dict[tuple, str] = {
+            key: "SELECT COALESCE(json_agg(q), '[]'::json) FROM (" + sql + ") q"
+            for key, sql in self._stmt_cache.items()
+            if key[0] in JSON_ROW_QUERIES
+        }
+
+        # Short-lived cache for slow-moving analytical lookups, keyed on the
+        # query arguments. Call clear_result_cache() after loading new data.
+        self.result_cache = CacheService(default_ttl=300, max_entries=4096)
+
+        # Flipped off the first time vmsraw_market_percentiles turns out to be
+        # missing, so databases without the view go straight to live queries
+        self._percentiles_view_available = True
+        # Same for the PostGIS geography column used by find_nearby_jobs, and
+        # the earthdistance column tried next when PostGIS is missing
+        self._postgis_available = True
+        self._earthdistance_available = True
+
+    def clear_result_cache(self) -> None:
+        """Drop cached query results (e.g. after new rows are ingested)"""
+        self.result_cache.clear()
+
+    def _statement(self, name: str, rate_column: Optional[str] = None) -> str:
+        """Look up the pre-rendered SQL for a query template and rate column"""
+        return self._stmt_cache[(name, rate_column)]
 
     def _normalize_specialty_for_query(self, specialty: str) -> str:
         """
@@ -68,12 +608,9 @@ class DatabaseService:
         Returns a regex pattern that matches all variations.
         Uses word boundaries to prevent false matches (e.g., ICU shouldn't match NICU)
         """
-        specialty_upper = specialty.upper().strip()
-
-        # Special handling for CRNA - match both variations
-        if specialty_upper == "CRNA":
-            # Match "APRN - CRNA" OR "Certified Nurse Anesthetist" OR just "CRNA"
-            return "(APRN - CRNA|Certified Nurse Anesthetist|\\bCRNA\\b)"
+        pattern = SPECIALTY_PATTERNS.get(specialty.upper().strip())
+        if pattern:
+            return pattern
 
         # For other specialties, use word boundaries to prevent substring matches
         # Example: "ICU" should match "RN - ICU" but NOT "RN - NICU"
@@ -90,20 +627,21 @@ class DatabaseService:
                 user=self.user,
                 password=self.password,
                 database=self.database,
-                min_size=2,
-                max_size=10,
+                min_size=self.pool_min_size,
+                max_size=self.pool_max_size,
+                statement_cache_size=self.statement_cache_size,
                 command_timeout=60
             )
-            print(f"✅ Database pool created: {self.database}@{self.host}")
+            logger.info("✅ Database pool created: %s@%s", self.database, self.host)
         except Exception as e:
-            print(f"❌ Database connection failed: {e}")
+            logger.error("❌ Database connection failed: %s", e)
             raise
 
     async def close(self):
         """Close database connection pool"""
         if self.pool:
             await self.pool.close()
-            print("Database pool closed")
+            logger.info("Database pool closed")
 
     async def execute_query(self, query: str, *args) -> List[Dict]:
         """Execute a SELECT query and return results"""
@@ -114,6 +652,34 @@ class DatabaseService:
             rows = await conn.fetch(query, *args)
             return [dict(row) for row in rows]
 
+    async def fetch_records(self, query: str, *args) -> List[asyncpg.Record]:
+        """Execute a SELECT query and return the raw asyncpg records"""
+        if not self.pool:
+            raise Exception("Database pool not initialized")
+
+        async with self.pool.acquire() as conn:
+            return await conn.fetch(query, *args)
+
+    async def fetch_json_rows(self, name: str, rate_column: Optional[str], *args) -> List[Dict[str, Any]]:
+        """Run one of JSON_ROW_QUERIES and return its rows as Postgres-built dicts"""
+        if not self.pool:
+            raise Exception("Database pool not initialized")
+
+        async with self.pool.acquire() as conn:
+            payload = await conn.fetchval(self._json_stmt_cache[(name, rate_column)], *args)
+            return json.loads(payload)
+
+    async def iter_records(self, query: str, *args, prefetch: Optional[int] = None) -> AsyncIterator[asyncpg.Record]:
+        """Stream a SELECT query's records through a server-side cursor"""
+        if not self.pool:
+            raise Exception("Database pool not initialized")
+
+        async with self.pool.acquire() as conn:
+            # Cursors only live inside a transaction
+            async with conn.transaction():
+                async for record in conn.cursor(query, *args, prefetch=prefetch):
+                    yield record
+
     async def execute_one(self, query: str, *args) -> Optional[Dict]:
         """Execute a SELECT query and return single result"""
         if not self.pool:
@@ -131,7 +697,7 @@ class DatabaseService:
         """
         try:
             if not self.pool:
-                print("❌ Database pool not initialized - cannot query rates")
+                logger.warning("❌ Database pool not initialized - cannot query rates")
                 return None
 
             specialty = getattr(parameters, 'specialty', None)
@@ -153,15 +719,14 @@ class DatabaseService:
                 rate_column = '"billRate"'
                 rate_label = 'bill rate'
 
-            # Build profession filter clause
-            profession_filter = self._get_profession_filter(profession)
             if profession:
-                print(f"🎯 Profession filter active: {profession}")
+                logger.debug("🎯 Profession filter active: %s", profession)
 
             # Normalize specialty to handle database variations (e.g., CRNA)
             normalized_specialty = self._normalize_specialty_for_query(specialty) if specialty else None
 
-            print(f"🔍 Database query: specialty='{specialty}' (normalized: '{normalized_specialty}'), city='{city}', state='{state}', location='{location}', rate_type='{rate_column}'")
+            logger.debug("🔍 Database query: specialty='%s' (normalized: '%s'), city='%s', state='%s', location='%s', rate_type='%s'",
+                         specialty, normalized_specialty, city, state, location, rate_column)
 
             if not specialty:
                 return None
@@ -183,117 +748,35 @@ class DatabaseService:
 
             # Try city + state first (most specific)
             if city and state:
-                print(f"  Trying city-level query: {city}, {state}")
-                query = f"""
-                    SELECT
-                        "newSpecialty" as specialty,
-                        city,
-                        state as location,
-                        AVG({rate_column}) * 0.975 as recommended_min,
-                        AVG({rate_column}) * 1.025 as recommended_max,
-                        PERCENTILE_CONT({floor_percentile}) WITHIN GROUP (ORDER BY {rate_column}) as competitive_floor,
-                        AVG({rate_column}) as market_average,
-                        AVG("weeklyPay") as avg_weekly_pay,
-                        AVG("hourlyPay") as avg_hourly_pay,
-                        AVG("billRate") as avg_bill_rate,
-                        COUNT(*) as sample_size
-                    FROM vmsrawscrape_prod
-                    WHERE "newSpecialty" ~ $1
-                        AND LOWER(city) = LOWER($2)
-                        AND LOWER(state) = LOWER($3)
-                        AND {rate_column} IS NOT NULL
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                        AND "startDate" >= NOW() - INTERVAL '3 months'
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                        {profession_filter}
-                    GROUP BY "newSpecialty", city, state
-                    HAVING COUNT(*) >= 5
-                    ORDER BY COUNT(*) DESC
-                    LIMIT 1
-                """
-                result = await self.execute_one(query, normalized_specialty, city, state)
+                logger.debug("  Trying city-level query: %s, %s", city, state)
+                query = self._statement('rate_recommendation_city', rate_column)
+                result = await self.execute_one(query, normalized_specialty, city, state, floor_percentile, profession)
 
                 if result:
-                    print(f"  ✅ Found {result.get('sample_size')} records for {city}, {state}")
+                    logger.debug("  ✅ Found %s records for %s, %s", result.get('sample_size'), city, state)
                 else:
-                    print(f"  ⚠️ Not enough data for {city}, falling back to state-level")
+                    logger.debug("  ⚠️ Not enough data for %s, falling back to state-level", city)
 
             # Fall back to state only if city didn't work or wasn't specified
             if not result and (state or location):
                 state_code = state or location
-                print(f"  Trying state-level query: {state_code}")
-                query = f"""
-                    SELECT
-                        "newSpecialty" as specialty,
-                        state as location,
-                        AVG({rate_column}) * 0.975 as recommended_min,
-                        AVG({rate_column}) * 1.025 as recommended_max,
-                        PERCENTILE_CONT({floor_percentile}) WITHIN GROUP (ORDER BY {rate_column}) as competitive_floor,
-                        AVG({rate_column}) as market_average,
-                        AVG("weeklyPay") as avg_weekly_pay,
-                        AVG("hourlyPay") as avg_hourly_pay,
-                        AVG("billRate") as avg_bill_rate,
-                        COUNT(*) as sample_size
-                    FROM vmsrawscrape_prod
-                    WHERE "newSpecialty" ~ $1
-                        AND LOWER(state) = LOWER($2)
-                        AND {rate_column} IS NOT NULL
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                        AND "startDate" >= NOW() - INTERVAL '3 months'
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                        {profession_filter}
-                    GROUP BY "newSpecialty", state
-                    ORDER BY COUNT(*) DESC
-                    LIMIT 1
-                """
-                result = await self.execute_one(query, normalized_specialty, state_code)
+                logger.debug("  Trying state-level query: %s", state_code)
+                query = self._statement('rate_recommendation_state', rate_column)
+                result = await self.execute_one(query, normalized_specialty, state_code, floor_percentile, profession)
 
                 if result:
-                    print(f"  ✅ Found {result.get('sample_size')} records for state {state_code}")
+                    logger.debug("  ✅ Found %s records for state %s", result.get('sample_size'), state_code)
 
             # If still no result, try national (aggregate across ALL states)
             if not result:
-                print(f"  Trying national-level query (all states aggregated)")
-                query = f"""
-                    SELECT
-                        "newSpecialty" as specialty,
-                        'National' as location,
-                        AVG({rate_column}) * 0.975 as recommended_min,
-                        AVG({rate_column}) * 1.025 as recommended_max,
-                        PERCENTILE_CONT({floor_percentile}) WITHIN GROUP (ORDER BY {rate_column}) as competitive_floor,
-                        AVG({rate_column}) as market_average,
-                        AVG("weeklyPay") as avg_weekly_pay,
-                        AVG("hourlyPay") as avg_hourly_pay,
-                        AVG("billRate") as avg_bill_rate,
-                        COUNT(*) as sample_size
-                    FROM vmsrawscrape_prod
-                    WHERE "newSpecialty" ~ $1
-                        AND {rate_column} IS NOT NULL
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                        AND "startDate" >= NOW() - INTERVAL '3 months'
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                        {profession_filter}
-                    GROUP BY "newSpecialty"
-                    HAVING COUNT(*) >= 5
-                """
-                result = await self.execute_one(query, normalized_specialty)
+                logger.debug("  Trying national-level query (all states aggregated)")
+                query = self._statement('rate_recommendation_national', rate_column)
+                result = await self.execute_one(query, normalized_specialty, floor_percentile, profession)
 
                 if result:
-                    print(f"  ✅ Found {result.get('sample_size')} records nationally")
+                    logger.debug("  ✅ Found %s records nationally", result.get('sample_size'))
 
-            print(f"📊 Query result: {result}")
+            logger.debug("📊 Query result: %s", result)
 
             if result:
                 return {
@@ -313,7 +796,7 @@ class DatabaseService:
             return None
 
         except Exception as e:
-            print(f"Error getting rate recommendation: {e}")
+            logger.error("Error getting rate recommendation: %s", e)
             return None
 
     async def get_lead_opportunities(self, parameters) -> Optional[Dict[str, Any]]:
@@ -324,13 +807,13 @@ class DatabaseService:
         """
         try:
             if not self.pool:
-                print("❌ Database pool not initialized - cannot query leads")
+                logger.warning("❌ Database pool not initialized - cannot query leads")
                 return None
 
             specialty = getattr(parameters, 'specialty', None)
             location = getattr(parameters, 'location', None)
 
-            print(f"🔍 Lead query: specialty='{specialty}', location='{location}'")
+            logger.debug("🔍 Lead query: specialty='%s', location='%s'", specialty, location)
 
             # Query using actual table name: vmsrawscrape_prod
             # Get top opportunities by bill rate with fuzzy matching
@@ -457,7 +940,7 @@ class DatabaseService:
             return None
 
         except Exception as e:
-            print(f"Error getting lead opportunities: {e}")
+            logger.error("Error getting lead opportunities: %s", e)
             return None
 
     async def get_clients_by_rate(self, parameters, target_rate: float = None, rate_tolerance: float = 10.0) -> Optional[Dict[str, Any]]:
@@ -471,7 +954,7 @@ class DatabaseService:
         """
         try:
             if not self.pool:
-                print("❌ Database pool not initialized - cannot query clients")
+                logger.warning("❌ Database pool not initialized - cannot query clients")
                 return None
 
             specialty = getattr(parameters, 'specialty', None)
@@ -491,92 +974,20 @@ class DatabaseService:
                 rate_column = '"billRate"'
                 rate_label = 'Bill Rate ($/hr)'
 
-            print(f"🔍 Client search: specialty='{specialty}', location='{location}', rate_column={rate_column}, filter='{rate_filter}', target_rate={target_rate}")
+            logger.debug("🔍 Client search: specialty='%s', location='%s', rate_column=%s, filter='%s', target_rate=%s",
+                         specialty, location, rate_column, rate_filter, target_rate)
 
             # Handle different rate filters
             if rate_filter == 'highest' or rate_filter == 'lowest':
                 # Query for highest or lowest paying clients
-                order_direction = "DESC" if rate_filter == 'highest' else "ASC"
+                sort_sign = 1 if rate_filter == 'highest' else -1
 
                 if specialty and location:
-                    query = f"""
-                        SELECT DISTINCT
-                            "clientName" as client_name,
-                            city,
-                            state,
-                            specialty,
-                            AVG({rate_column}) as avg_rate,
-                            COUNT(*) as assignment_count,
-                            MAX("startDate") as most_recent
-                        FROM vmsrawscrape_prod
-                        WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
-                            AND LOWER(state) = LOWER($2)
-                            AND {rate_column} IS NOT NULL
-                            AND "billRate" BETWEEN 30 AND 800
-                            AND "weeklyPay" BETWEEN 1200 AND 15000
-                            AND "hourlyPay" BETWEEN 10 AND 250
-                            AND "startDate" >= CURRENT_DATE
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                            AND "clientName" IS NOT NULL
-                        GROUP BY "clientName", city, state, specialty
-                        ORDER BY avg_rate {order_direction}
-                        LIMIT 15
-                    """
-                    results = await self.execute_query(query, specialty, location)
+                    results = await self.fetch_json_rows('clients_ranked_specialty_location', rate_column, specialty, location, sort_sign)
                 elif specialty:
-                    query = f"""
-                        SELECT DISTINCT
-                            "clientName" as client_name,
-                            city,
-                            state,
-                            specialty,
-                            AVG({rate_column}) as avg_rate,
-                            COUNT(*) as assignment_count,
-                            MAX("startDate") as most_recent
-                        FROM vmsrawscrape_prod
-                        WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
-                            AND {rate_column} IS NOT NULL
-                            AND "billRate" BETWEEN 30 AND 800
-                            AND "weeklyPay" BETWEEN 1200 AND 15000
-                            AND "hourlyPay" BETWEEN 10 AND 250
-                            AND "startDate" >= CURRENT_DATE
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                            AND "clientName" IS NOT NULL
-                        GROUP BY "clientName", city, state, specialty
-                        ORDER BY avg_rate {order_direction}
-                        LIMIT 15
-                    """
-                    results = await self.execute_query(query, specialty)
+                    results = await self.fetch_json_rows('clients_ranked_specialty', rate_column, specialty, sort_sign)
                 elif location:
-                    query = f"""
-                        SELECT DISTINCT
-                            "clientName" as client_name,
-                            city,
-                            state,
-                            specialty,
-                            AVG({rate_column}) as avg_rate,
-                            COUNT(*) as assignment_count,
-                            MAX("startDate") as most_recent
-                        FROM vmsrawscrape_prod
-                        WHERE LOWER(state) = LOWER($1)
-                            AND {rate_column} IS NOT NULL
-                            AND "billRate" BETWEEN 30 AND 800
-                            AND "weeklyPay" BETWEEN 1200 AND 15000
-                            AND "hourlyPay" BETWEEN 10 AND 250
-                            AND "startDate" >= CURRENT_DATE
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                            AND "clientName" IS NOT NULL
-                        GROUP BY "clientName", city, state, specialty
-                        ORDER BY avg_rate {order_direction}
-                        LIMIT 15
-                    """
-                    results = await self.execute_query(query, location)
+                    results = await self.fetch_json_rows('clients_ranked_location', rate_column, location, sort_sign)
                 else:
                     return None
 
@@ -584,21 +995,8 @@ class DatabaseService:
                 # Handle "similar" filter - need a target rate
                 if target_rate is None:
                     # Get market average as target
-                    avg_query = f"""
-                        SELECT AVG({rate_column}) as avg_rate
-                        FROM vmsrawscrape_prod
-                        WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
-                            AND {rate_column} IS NOT NULL
-                            AND "startDate" >= CURRENT_DATE
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                    """
-                    if location:
-                        avg_query += " AND LOWER(state) = LOWER($2)"
-                        avg_result = await self.execute_one(avg_query, specialty, location)
-                    else:
-                        avg_result = await self.execute_one(avg_query, specialty)
+                    avg_query = self._statement('clients_market_average', rate_column)
+                    avg_result = await self.execute_one(avg_query, specialty, location)
 
                     if avg_result and avg_result.get('avg_rate'):
                         target_rate = float(avg_result['avg_rate'])
@@ -611,75 +1009,16 @@ class DatabaseService:
 
                 # Build client search query for similar rates
                 if specialty and location:
-                    query = f"""
-                        SELECT DISTINCT
-                            "clientName" as client_name,
-                            city,
-                            state,
-                            specialty,
-                            AVG({rate_column}) as avg_rate,
-                            COUNT(*) as assignment_count,
-                            MAX("startDate") as most_recent
-                        FROM vmsrawscrape_prod
-                        WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
-                            AND LOWER(state) = LOWER($2)
-                            AND {rate_column} BETWEEN $3 AND $4
-                            AND {rate_column} IS NOT NULL
-                            AND "startDate" >= CURRENT_DATE
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                            AND "clientName" IS NOT NULL
-                        GROUP BY "clientName", city, state, specialty
-                        ORDER BY assignment_count DESC, avg_rate DESC
-                        LIMIT 15
-                    """
-                    results = await self.execute_query(query, specialty, location, min_rate, max_rate)
+                    results = await self.fetch_json_rows('clients_similar_specialty_location', rate_column, specialty, location, min_rate, max_rate)
                 elif specialty:
-                    query = f"""
-                        SELECT DISTINCT
-                            "clientName" as client_name,
-                            city,
-                            state,
-                            specialty,
-                            AVG({rate_column}) as avg_rate,
-                            COUNT(*) as assignment_count,
-                            MAX("startDate") as most_recent
-                        FROM vmsrawscrape_prod
-                        WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
-                            AND {rate_column} BETWEEN $2 AND $3
-                            AND {rate_column} IS NOT NULL
-                            AND "startDate" >= CURRENT_DATE
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                            AND "clientName" IS NOT NULL
-                        GROUP BY "clientName", city, state, specialty
-                        ORDER BY assignment_count DESC, avg_rate DESC
-                        LIMIT 15
-                    """
-                    results = await self.execute_query(query, specialty, min_rate, max_rate)
+                    results = await self.fetch_json_rows('clients_similar_specialty', rate_column, specialty, min_rate, max_rate)
                 else:
                     return None
 
             if results:
-                clients = []
-                for row in results:
-                    most_recent = row.get('most_recent')
-                    client = {
-                        "client_name": row.get('client_name', 'Unknown'),
-                        "city": row.get('city', ''),
-                        "state": row.get('state', ''),
-                        "specialty": row.get('specialty', ''),
-                        "avg_rate": float(row.get('avg_rate', 0)),
-                        "assignment_count": int(row.get('assignment_count', 0)),
-                        "most_recent": most_recent.isoformat() if most_recent else None
-                    }
-                    clients.append(client)
-
                 response = {
-                    "clients": clients,
-                    "total_clients": len(clients),
+                    "clients": results,
+                    "total_clients": len(results),
                     "specialty": specialty,
                     "location": location,
                     "rate_filter": rate_filter,
@@ -697,7 +1036,7 @@ class DatabaseService:
             return None
 
         except Exception as e:
-            print(f"Error getting clients by rate: {e}")
+            logger.error("Error getting clients by rate: %s", e)
             return None
 
     async def get_comparable_jobs(self, parameters, target_rate: float = None, rate_range: tuple = None) -> Optional[Dict[str, Any]]:
@@ -711,7 +1050,7 @@ class DatabaseService:
         """
         try:
             if not self.pool:
-                print("❌ Database pool not initialized")
+                logger.warning("❌ Database pool not initialized")
                 return None
 
             specialty = getattr(parameters, 'specialty', None)
@@ -731,7 +1070,8 @@ class DatabaseService:
                 rate_column = '"billRate"'
                 rate_label = 'bill rate'
 
-            print(f"🔍 Looking for comparable jobs: specialty='{specialty}', city='{city}', state='{state}', rate_type='{rate_column}'")
+            logger.debug("🔍 Looking for comparable jobs: specialty='%s', city='%s', state='%s', rate_type='%s'",
+                         specialty, city, state, rate_column)
 
             # If rate_range is provided, use it; otherwise calculate from target_rate
             if rate_range:
@@ -744,82 +1084,19 @@ class DatabaseService:
                 # No rate context provided
                 return None
 
-            # Build query based on location specificity
+            if not (state or location):
+                return None
+
             if city and state:
                 # City-specific search
-                query = f"""
-                    SELECT
-                        specialty,
-                        "clientName" as client_name,
-                        city,
-                        state,
-                        {rate_column} as rate,
-                        "startDate" as start_date,
-                        "weeklyPay" as weekly_pay,
-                        "hourlyPay" as hourly_pay,
-                        "billRate" as bill_rate
-                    FROM vmsrawscrape_prod
-                    WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
-                        AND LOWER(city) = LOWER($2)
-                        AND LOWER(state) = LOWER($3)
-                        AND {rate_column} BETWEEN $4 AND $5
-                        AND {rate_column} IS NOT NULL
-                        AND "startDate" >= CURRENT_DATE
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                        AND "clientName" IS NOT NULL
-                    ORDER BY "startDate" ASC
-                    LIMIT 20
-                """
-                results = await self.execute_query(query, specialty, city, state, min_rate, max_rate)
-            elif state or location:
-                # State-level search
-                state_code = state or location
-                query = f"""
-                    SELECT
-                        specialty,
-                        "clientName" as client_name,
-                        city,
-                        state,
-                        {rate_column} as rate,
-                        "startDate" as start_date,
-                        "weeklyPay" as weekly_pay,
-                        "hourlyPay" as hourly_pay,
-                        "billRate" as bill_rate
-                    FROM vmsrawscrape_prod
-                    WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
-                        AND LOWER(state) = LOWER($2)
-                        AND {rate_column} BETWEEN $3 AND $4
-                        AND {rate_column} IS NOT NULL
-                        AND "startDate" >= CURRENT_DATE
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                        AND "clientName" IS NOT NULL
-                    ORDER BY "startDate" ASC
-                    LIMIT 20
-                """
-                results = await self.execute_query(query, specialty, state_code, min_rate, max_rate)
+                jobs_iter = self.iter_comparable_jobs(specialty, city, state, rate_column, min_rate, max_rate)
             else:
-                return None
+                # State-level search
+                jobs_iter = self.iter_comparable_jobs(specialty, None, state or location, rate_column, min_rate, max_rate)
 
-            if results:
-                jobs = []
-                for row in results:
-                    start_date = row.get('start_date')
-                    jobs.append({
-                        "specialty": row.get('specialty'),
-                        "client_name": row.get('client_name'),
-                        "city": row.get('city'),
-                        "state": row.get('state'),
-                        "rate": float(row.get('rate', 0)),
-                        "start_date": start_date.isoformat() if start_date else None,
-                        "weekly_pay": float(row.get('weekly_pay', 0)) if row.get('weekly_pay') else None,
-                        "hourly_pay": float(row.get('hourly_pay', 0)) if row.get('hourly_pay') else None,
-                        "bill_rate": float(row.get('bill_rate', 0)) if row.get('bill_rate') else None
-                    })
+            jobs = [job async for job in jobs_iter]
 
+            if jobs:
                 return {
                     "jobs": jobs,
                     "total_jobs": len(jobs),
@@ -833,9 +1110,46 @@ class DatabaseService:
             return None
 
         except Exception as e:
-            print(f"Error getting comparable jobs: {e}")
+            logger.error("Error getting comparable jobs: %s", e)
             return None
 
+    async def iter_comparable_jobs(self, specialty: str, city: Optional[str], state: str, rate_column: str,
+                                   min_rate: float, max_rate: float) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream comparable job positions as they come off the cursor
+
+        Args:
+            specialty: Normalized specialty name
+            city: Optional city; when omitted the search covers the whole state
+            state: State abbreviation
+            rate_column: Quoted rate column to filter on (one of RATE_COLUMNS)
+            min_rate: Lower bound of the rate window
+            max_rate: Upper bound of the rate window
+        """
+        if city:
+            query = self._statement('comparable_jobs_city', rate_column)
+            records = self.iter_records(query, specialty, city, state, min_rate, max_rate)
+        else:
+            query = self._statement('comparable_jobs_state', rate_column)
+            records = self.iter_records(query, specialty, state, min_rate, max_rate)
+
+        # The filtered column is already in the projection; pick it per row
+        # instead of selecting it a second time as "rate".
+        rate_index = RATE_COLUMNS.index(rate_column)
+
+        async for row_specialty, client_name, row_city, row_state, start_date, weekly_pay, hourly_pay, bill_rate in records:
+            yield {
+                "specialty": row_specialty,
+                "client_name": client_name,
+                "city": row_city,
+                "state": row_state,
+                "rate": float((hourly_pay, weekly_pay, bill_rate)[rate_index]),
+                "start_date": start_date.isoformat() if start_date else None,
+                "weekly_pay": float(weekly_pay) if weekly_pay else None,
+                "hourly_pay": float(hourly_pay) if hourly_pay else None,
+                "bill_rate": float(bill_rate) if bill_rate else None
+            }
+
     async def get_highest_rates_in_market(self, parameters) -> Optional[Dict[str, Any]]:
         """
         Get the highest rates in the market for competitive comparison
@@ -843,7 +1157,7 @@ class DatabaseService:
         """
         try:
             if not self.pool:
-                print("❌ Database pool not initialized")
+                logger.warning("❌ Database pool not initialized")
                 return None
 
             specialty = getattr(parameters, 'specialty', None)
@@ -863,78 +1177,74 @@ class DatabaseService:
                 rate_column = '"billRate"'
                 rate_label = 'bill rate'
 
-            print(f"🔍 Getting highest rates: specialty='{specialty}', city='{city}', state='{state}', rate_type='{rate_column}'")
+            logger.debug("🔍 Getting highest rates: specialty='%s', city='%s', state='%s', rate_type='%s'",
+                         specialty, city, state, rate_column)
 
-            # Get top 10% of rates (90th percentile and above)
-            if city and state:
-                query = f"""
-                    SELECT
-                        PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY {rate_column}) as percentile_75,
-                        PERCENTILE_CONT(0.90) WITHIN GROUP (ORDER BY {rate_column}) as percentile_90,
-                        MAX({rate_column}) as max_rate,
-                        AVG({rate_column}) as market_average,
-                        AVG("weeklyPay") as avg_weekly_pay,
-                        AVG("hourlyPay") as avg_hourly_pay,
-                        AVG("billRate") as avg_bill_rate,
-                        COUNT(*) as sample_size
-                    FROM vmsrawscrape_prod
-                    WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
-                        AND LOWER(city) = LOWER($2)
-                        AND LOWER(state) = LOWER($3)
-                        AND {rate_column} IS NOT NULL
-                        AND "startDate" >= NOW() - INTERVAL '3 months'
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                    HAVING COUNT(*) >= 5
-                """
-                result = await self.execute_one(query, specialty, city, state)
-            elif state or location:
-                state_code = state or location
-                query = f"""
-                    SELECT
-                        PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY {rate_column}) as percentile_75,
-                        PERCENTILE_CONT(0.90) WITHIN GROUP (ORDER BY {rate_column}) as percentile_90,
-                        MAX({rate_column}) as max_rate,
-                        AVG({rate_column}) as market_average,
-                        AVG("weeklyPay") as avg_weekly_pay,
-                        AVG("hourlyPay") as avg_hourly_pay,
-                        AVG("billRate") as avg_bill_rate,
-                        COUNT(*) as sample_size
-                    FROM vmsrawscrape_prod
-                    WHERE specialty ~ ('(^|\\s|-)' || $1 || '($|\\s)')
-                        AND LOWER(state) = LOWER($2)
-                        AND {rate_column} IS NOT NULL
-                        AND "startDate" >= NOW() - INTERVAL '3 months'
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                    GROUP BY specialty
-                """
-                result = await self.execute_one(query, specialty, state_code)
+            # Percentiles for every rate column are cached together, so asking
+            # about a different rate_type for the same market is free
+            cache_key = repr(('market_percentiles', specialty, city or '', state or '', location or ''))
+            result = self.result_cache.get(cache_key)
+            if result is not None:
+                logger.debug("  ✨ Using cached market rates")
             else:
-                return None
+                # Get top 10% of rates (90th percentile and above), preferring the
+                # precomputed view and falling back to computing them live
+                if city and state:
+                    result = await self._lookup_market_percentiles(specialty, city, state)
+                    if result is None:
+                        query = self._statement('highest_rates_city')
+                        result = await self.execute_one(query, specialty, city, state)
+                elif state or location:
+                    state_code = state or location
+                    result = await self._lookup_market_percentiles(specialty, None, state_code)
+                    if result is None:
+                        query = self._statement('highest_rates_state')
+                        result = await self.execute_one(query, specialty, state_code)
+                else:
+                    return None
+
+                if result:
+                    self.result_cache.set(cache_key, result)
 
             if result:
+                prefix = RATE_PREFIXES[rate_column]
                 return {
                     "specialty": specialty,
                     "city": city,
                     "state": state or location,
-                    "percentile_75": float(result.get('percentile_75', 0)),
-                    "percentile_90": float(result.get('percentile_90', 0)),
-                    "max_rate": float(result.get('max_rate', 0)),
-                    "market_average": float(result.get('market_average', 0)),
-                    "avg_weekly_pay": float(result.get('avg_weekly_pay', 0)) if result.get('avg_weekly_pay') else None,
-                    "avg_hourly_pay": float(result.get('avg_hourly_pay', 0)) if result.get('avg_hourly_pay') else None,
-                    "avg_bill_rate": float(result.get('avg_bill_rate', 0)) if result.get('avg_bill_rate') else None,
+                    "percentile_75": float(result[f'{prefix}_p75']),
+                    "percentile_90": float(result[f'{prefix}_p90']),
+                    "max_rate": float(result[f'{prefix}_max']),
+                    "market_average": float(result[f'{prefix}_avg']),
+                    "avg_weekly_pay": float(result['weekly_avg']) if result['weekly_avg'] else None,
+                    "avg_hourly_pay": float(result['hourly_avg']) if result['hourly_avg'] else None,
+                    "avg_bill_rate": float(result['bill_avg']) if result['bill_avg'] else None,
                     "rate_type_label": rate_label,
-                    "sample_size": int(result.get('sample_size', 0))
+                    "sample_size": int(result['sample_size'])
                 }
 
             return None
 
         except Exception as e:
-            print(f"Error getting highest rates: {e}")
+            logger.error("Error getting highest rates: %s", e)
+            return None
+
+    async def _lookup_market_percentiles(self, specialty: str, city: Optional[str], state: str) -> Optional[Dict[str, Any]]:
+        """
+        Read market percentiles from the vmsraw_market_percentiles view
+
+        Only exact specialty matches are served from the view, and city rows
+        only when no other specialty in that city matches the same token;
+        returns None otherwise (or with no view) so the caller can query live.
+        """
+        if not self._percentiles_view_available:
+            return None
+
+        try:
+            return await self.execute_one(self._statement('market_percentiles_lookup'), specialty, city, state)
+        except asyncpg.UndefinedTableError:
+            logger.warning("⚠️ vmsraw_market_percentiles not found - computing percentiles live")
+            self._percentiles_view_available = False
             return None
 
     async def get_vendors_at_location(self, client_name: str, city: str = None, state: str = None, specialty: str = None) -> Optional[Dict[str, Any]]:
@@ -949,84 +1259,18 @@ class DatabaseService:
         """
         try:
             if not self.pool:
-                print("❌ Database pool not initialized")
+                logger.warning("❌ Database pool not initialized")
                 return None
 
-            print(f"🔍 Looking for vendors at: client='{client_name}', city='{city}', state='{state}', specialty='{specialty}'")
-
-            # Build query with optional filters
-            where_clauses = []
-            params = []
-            param_num = 1
+            logger.debug("🔍 Looking for vendors at: client='%s', city='%s', state='%s', specialty='%s'",
+                         client_name, city, state, specialty)
 
-            # Client name - use ILIKE for partial matching
-            where_clauses.append(f'"clientName" ILIKE ${param_num}')
-            params.append(f'%{client_name}%')
-            param_num += 1
-
-            if city:
-                where_clauses.append(f'LOWER(city) = LOWER(${param_num})')
-                params.append(city)
-                param_num += 1
-
-            if state:
-                where_clauses.append(f'LOWER(state) = LOWER(${param_num})')
-                params.append(state)
-                param_num += 1
-
-            if specialty:
-                where_clauses.append(f'specialty ~ (\'(^|\\s|-)\' || ${param_num} || \'($|\\s)\')')
-                params.append(specialty)
-                param_num += 1
-
-            where_clause = ' AND '.join(where_clauses)
-
-            query = f"""
-                SELECT
-                    "vendorName" as vendor_name,
-                    "clientName" as client_name,
-                    city,
-                    state,
-                    specialty,
-                    COUNT(*) as assignment_count,
-                    AVG("billRate") as avg_bill_rate,
-                    AVG("hourlyPay") as avg_hourly_pay,
-                    AVG("weeklyPay") as avg_weekly_pay,
-                    MAX("startDate") as most_recent
-                FROM vmsrawscrape_prod
-                WHERE {where_clause}
-                    AND "vendorName" IS NOT NULL
-                    AND "startDate" >= NOW() - INTERVAL '6 months'
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                GROUP BY "vendorName", "clientName", city, state, specialty
-                ORDER BY assignment_count DESC, most_recent DESC
-                LIMIT 20
-            """
-
-            results = await self.execute_query(query, *params)
+            results = await self.fetch_json_rows('vendors_at_location', None, f'%{client_name}%', city or None, state or None, specialty or None)
 
             if results:
-                vendors = []
-                for row in results:
-                    most_recent = row.get('most_recent')
-                    vendors.append({
-                        "vendor_name": row.get('vendor_name'),
-                        "client_name": row.get('client_name'),
-                        "city": row.get('city'),
-                        "state": row.get('state'),
-                        "specialty": row.get('specialty'),
-                        "assignment_count": int(row.get('assignment_count', 0)),
-                        "avg_bill_rate": float(row.get('avg_bill_rate', 0)) if row.get('avg_bill_rate') else None,
-                        "avg_hourly_pay": float(row.get('avg_hourly_pay', 0)) if row.get('avg_hourly_pay') else None,
-                        "avg_weekly_pay": float(row.get('avg_weekly_pay', 0)) if row.get('avg_weekly_pay') else None,
-                        "most_recent": most_recent.isoformat() if most_recent else None
-                    })
-
                 return {
-                    "vendors": vendors,
-                    "total_vendors": len(vendors),
+                    "vendors": results,
+                    "total_vendors": len(results),
                     "client_name": client_name,
                     "city": city,
                     "state": state,
@@ -1036,7 +1280,7 @@ class DatabaseService:
             return None
 
         except Exception as e:
-            print(f"Error getting vendors at location: {e}")
+            logger.error("Error getting vendors at location: %s", e)
             return None
 
     async def get_vendor_info(self, vendor_name: str, specialty: str = None) -> Optional[Dict[str, Any]]:
@@ -1047,7 +1291,7 @@ class DatabaseService:
         """
         try:
             if not self.pool:
-                print("❌ Database pool not initialized - cannot query vendor info")
+                logger.warning("❌ Database pool not initialized - cannot query vendor info")
                 return None
 
             query = """
@@ -1082,7 +1326,7 @@ class DatabaseService:
             return None
 
         except Exception as e:
-            print(f"Error getting vendor info: {e}")
+            logger.error("Error getting vendor info: %s", e)
             return None
 
     async def get_rate_trends_by_state(self, parameters, trend_direction: str = 'rising', limit: int = 5) -> Optional[Dict[str, Any]]:
@@ -1098,7 +1342,7 @@ class DatabaseService:
         """
         try:
             if not self.pool:
-                print("❌ Database pool not initialized")
+                logger.warning("❌ Database pool not initialized")
                 return None
 
             specialty = getattr(parameters, 'specialty', None)
@@ -1121,65 +1365,17 @@ class DatabaseService:
 
             # Normalize specialty
             normalized_specialty = self._normalize_specialty_for_query(specialty) if specialty else None
-            profession_filter = self._get_profession_filter(profession)
 
-            print(f"🔍 Analyzing rate trends: specialty='{specialty}', rate_type='{rate_label}', direction='{trend_direction}'")
+            logger.debug("🔍 Analyzing rate trends: specialty='%s', rate_type='%s', direction='%s'",
+                         specialty, rate_label, trend_direction)
 
             # Query to compare recent vs older rates by state
-            order = "DESC" if trend_direction == 'rising' else "ASC"
-            # Filter direction: rising = positive changes, falling = negative changes
-            direction_filter = "> 0" if trend_direction == 'rising' else "< 0"
+            # Rising keeps positive changes sorted high-to-low, falling keeps
+            # negative changes sorted low-to-high
+            direction_sign = 1 if trend_direction == 'rising' else -1
 
-            query = f"""
-                WITH recent_rates AS (
-                    SELECT
-                        state,
-                        AVG({rate_column}) as avg_rate,
-                        COUNT(*) as sample_size
-                    FROM vmsrawscrape_prod
-                    WHERE "newSpecialty" ~ $1
-                        AND {rate_column} IS NOT NULL
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                        AND "startDate" >= NOW() - INTERVAL '30 days'
-                        {profession_filter}
-                    GROUP BY state
-                    HAVING COUNT(*) >= 2
-                ),
-                older_rates AS (
-                    SELECT
-                        state,
-                        AVG({rate_column}) as avg_rate,
-                        COUNT(*) as sample_size
-                    FROM vmsrawscrape_prod
-                    WHERE "newSpecialty" ~ $1
-                        AND {rate_column} IS NOT NULL
-                        AND "billRate" BETWEEN 30 AND 800
-                        AND "weeklyPay" BETWEEN 1200 AND 15000
-                        AND "hourlyPay" BETWEEN 10 AND 250
-                        AND "startDate" >= NOW() - INTERVAL '90 days'
-                        AND "startDate" < NOW() - INTERVAL '30 days'
-                        {profession_filter}
-                    GROUP BY state
-                    HAVING COUNT(*) >= 2
-                )
-                SELECT
-                    r.state,
-                    r.avg_rate as recent_rate,
-                    o.avg_rate as older_rate,
-                    ((r.avg_rate - o.avg_rate) / o.avg_rate * 100) as percent_change,
-                    r.sample_size as recent_sample_size,
-                    o.sample_size as older_sample_size
-                FROM recent_rates r
-                JOIN older_rates o ON r.state = o.state
-                WHERE ((r.avg_rate - o.avg_rate) / o.avg_rate * 100) {direction_filter}
-                    AND ABS((r.avg_rate - o.avg_rate) / o.avg_rate * 100) >= 1.0
-                ORDER BY percent_change {order}
-                LIMIT $2
-            """
-
-            results = await self.execute_query(query, normalized_specialty, limit)
+            query = self._statement('rate_trends_by_state', rate_column)
+            results = await self.execute_query(query, normalized_specialty, limit, direction_sign, profession)
 
             if results:
                 trends = []
@@ -1204,7 +1400,7 @@ class DatabaseService:
             return None
 
         except Exception as e:
-            print(f"Error getting rate trends: {e}")
+            logger.error("Error getting rate trends: %s", e)
             return None
 
     async def get_vendor_for_client(self, client_name: str, city: str = None, state: str = None) -> Optional[Dict[str, Any]]:
@@ -1225,11 +1421,18 @@ class DatabaseService:
             - state: State if filtered
         """
         try:
-            print(f"🔍 Looking up vendor/MSP for client: {client_name}")
+            logger.debug("🔍 Looking up vendor/MSP for client: %s", client_name)
             if city:
-                print(f"   City filter: {city}")
+                logger.debug("   City filter: %s", city)
             if state:
-                print(f"   State filter: {state}")
+                logger.debug("   State filter: %s", state)
+
+            cache_key = repr(('vendor_for_client', client_name, city or '', state or ''))
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("  ✨ Using cached vendor lookup")
+                # Copy so callers can't modify the cached entry
+                return dict(cached)
 
             # Build WHERE clause with optional city/state filters
             where_conditions = ['"clientName" ILIKE $1']
@@ -1341,29 +1544,127 @@ class DatabaseService:
 
             if result and result.get('vendors'):
                 # Parse vendors JSON if it's a string
-                import json
                 vendors = result['vendors']
                 if isinstance(vendors, str):
                     vendors = json.loads(vendors)
 
-                print(f"  ✅ Found {len(vendors)} vendors:")
-                for v in vendors:
-                    print(f"     - {v['vendor_name']}: {v['vms_count']} jobs ({v['percentage']}%)")
-                print(f"  📊 Total active jobs: {result['total_jobs']}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("  ✅ Found %d vendors:", len(vendors))
+                    for v in vendors:
+                        logger.debug("     - %s: %s jobs (%s%%)", v['vendor_name'], v['vms_count'], v['percentage'])
+                    logger.debug("  📊 Total active jobs: %s", result['total_jobs'])
 
                 # Update result with parsed vendors
                 result['vendors'] = vendors
-                return result
+                self.result_cache.set(cache_key, result)
+                return dict(result)
             else:
-                print(f"  ⚠️ No vendor data found for client matching '{client_name}'")
+                logger.debug("  ⚠️ No vendor data found for client matching '%s'", client_name)
                 return None
 
         except Exception as e:
-            print(f"❌ Error getting vendor for client: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Error getting vendor for client: %s", e)
             return None
 
+    async def get_vendors_for_clients(self, client_names: List[str], city: str = None, state: str = None) -> Optional[Dict[str, Optional[Dict[str, Any]]]]:
+        """
+        Get the top 3 VMS vendors for several clients in a single query
+
+        Args:
+            client_names: Client/hospital/facility names (partial matches)
+            city: Optional city filter applied to every client
+            state: Optional state filter applied to every client
+
+        Returns:
+            Dict mapping each requested name to its vendor info (vendors,
+            total_jobs, client_name, city, state), or None when nothing matched
+        """
+        try:
+            if not self.pool:
+                logger.warning("❌ Database pool not initialized")
+                return None
+
+            # Duplicate names would only repeat the same rows
+            names = list(dict.fromkeys(client_names))
+            logger.debug("🔍 Looking up vendors/MSPs for %d clients", len(names))
+
+            query = self._statement('vendors_for_clients')
+            records = await self.fetch_records(query, names, city or None, state or None)
+
+            results: Dict[str, Optional[Dict[str, Any]]] = dict.fromkeys(names)
+            for idx, total_jobs, vendor_name, vms_count, percentage in records:
+                name = names[idx - 1]
+                entry = results[name]
+                if entry is None:
+                    entry = results[name] = {
+                        "vendors": [],
+                        "total_jobs": total_jobs,
+                        "client_name": name,
+                        "city": city,
+                        "state": state
+                    }
+                entry["vendors"].append({
+                    "vendor_name": vendor_name,
+                    "vms_count": vms_count,
+                    "percentage": float(percentage)
+                })
+
+            return results
+
+        except Exception as e:
+            logger.error("❌ Error getting vendors for clients: %s", e)
+            return None
+
+    def _nearby_jobs_filters(self, specialty: Optional[str], rate_type: str, min_rate: Optional[float],
+                             profession: Optional[str]) -> tuple:
+        """
+        Build the non-spatial WHERE clause shared by the nearby-job searches
+
+        Returns:
+            Tuple of (where_clause, params, rate_column); params are numbered from $1
+        """
+        # Build WHERE conditions. The recency cutoff (last ~3 months) is
+        # bound as a value rather than NOW() - INTERVAL so the planner sees
+        # a constant it can prune partitions and pick indexes with.
+        where_conditions = [
+            'latitude IS NOT NULL',
+            'longitude IS NOT NULL',
+            '"startDate" >= $1'
+        ]
+
+        params = [datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=92)]
+        param_count = 1
+
+        if specialty:
+            normalized_specialty = self._normalize_specialty_for_query(specialty)
+            param_count += 1
+            where_conditions.append(f'"newSpecialty" ~ ${param_count}')
+            params.append(normalized_specialty)
+
+        if profession:
+            param_count += 1
+            where_conditions.append(f'"newProfession" = ${param_count}')
+            params.append(profession)
+
+        # Map rate_type to column name
+        rate_column_map = {
+            "billRate": "billRate",
+            "bill_rate": "billRate",
+            "weeklyPay": "weeklyPay",
+            "weekly_pay": "weeklyPay",
+            "hourlyPay": "hourlyPay",
+            "hourly_pay": "hourlyPay"
+        }
+        rate_column = rate_column_map.get(rate_type, "billRate")
+        where_conditions.append(f'"{rate_column}" IS NOT NULL')
+
+        if min_rate:
+            param_count += 1
+            where_conditions.append(f'"{rate_column}" >= ${param_count}')
+            params.append(min_rate)
+
+        return " AND ".join(where_conditions), params, rate_column
+
     async def find_nearby_jobs(
         self,
         center_lat: float,
@@ -1392,99 +1693,270 @@ class DatabaseService:
             List of jobs with distance information, sorted by distance
         """
         try:
-            print(f"🔍 Finding jobs within {radius_miles} miles of ({center_lat}, {center_lon})")
+            logger.debug("🔍 Finding jobs within %s miles of (%s, %s)", radius_miles, center_lat, center_lon)
 
-            # Build WHERE conditions
-            where_conditions = [
-                'latitude IS NOT NULL',
-                'longitude IS NOT NULL',
-                '"startDate" >= NOW() - INTERVAL \'3 months\''  # Recent jobs (last 3 months)
+            results = [
+                job async for job in self.iter_nearby_jobs(
+                    center_lat, center_lon, radius_miles, specialty, rate_type, min_rate, profession, limit
+                )
             ]
 
-            params = []
-            param_count = 0
+            # The per-row lines index into results, so skip the loop entirely
+            # unless debug output is actually on
+            if logger.isEnabledFor(logging.DEBUG):
+                if results:
+                    logger.debug("  ✅ Found %d jobs within %s miles", len(results), radius_miles)
+                    for i, job in enumerate(results[:3], 1):
+                        logger.debug("     %d. %s - %s - %.1f mi - $%.0f", i, job['clientName'], job['newSpecialty'], job['distance_miles'], job['rate'])
+                else:
+                    logger.debug("  ⚠️ No jobs found within %s miles", radius_miles)
 
-            if specialty:
-                normalized_specialty = self._normalize_specialty_for_query(specialty)
-                param_count += 1
-                where_conditions.append(f'"newSpecialty" ~ ${param_count}')
-                params.append(normalized_specialty)
+            return results
 
-            if profession:
-                param_count += 1
-                where_conditions.append(f'"newProfession" = ${param_count}')
-                params.append(profession)
-
-            # Map rate_type to column name
-            rate_column_map = {
-                "billRate": "billRate",
-                "bill_rate": "billRate",
-                "weeklyPay": "weeklyPay",
-                "weekly_pay": "weeklyPay",
-                "hourlyPay": "hourlyPay",
-                "hourly_pay": "hourlyPay"
-            }
-            rate_column = rate_column_map.get(rate_type, "billRate")
-            where_conditions.append(f'"{rate_column}" IS NOT NULL')
+        except Exception as e:
+            logger.exception("❌ Error finding nearby jobs: %s", e)
+            return None
 
-            if min_rate:
-                param_count += 1
-                where_conditions.append(f'"{rate_column}" >= ${param_count}')
-                params.append(min_rate)
+    async def iter_nearby_jobs(
+        self,
+        center_lat: float,
+        center_lon: float,
+        radius_miles: float = 50,
+        specialty: str = None,
+        rate_type: str = "billRate",
+        min_rate: float = None,
+        profession: str = None,
+        limit: int = 20
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream jobs within a radius of a location, nearest first
 
-            where_clause = " AND ".join(where_conditions)
+        Takes the same arguments as find_nearby_jobs. Rows come off a
+        server-side cursor, so a caller that stops early never fetches the rest.
+        """
+        where_clause, params, rate_column = self._nearby_jobs_filters(specialty, rate_type, min_rate, profession)
+        async for job in self._iter_nearby_jobs(
+            where_clause, params, rate_column, center_lat, center_lon, radius_miles, limit
+        ):
+            yield job
+
+    async def _iter_nearby_jobs(self, where_clause: str, params: list, rate_column: str,
+                                center_lat: float, center_lon: float,
+                                radius_miles: float, limit: int) -> AsyncIterator[Dict[str, Any]]:
+        """Run the radius search with the best spatial index the database has"""
+        args = (where_clause, params, rate_column, center_lat, center_lon, radius_miles, limit)
+        while True:
+            if self._postgis_available:
+                strategy, (query, query_args) = 'postgis', self._nearby_jobs_postgis_sql(*args)
+            elif self._earthdistance_available:
+                strategy, (query, query_args) = 'earthdistance', self._nearby_jobs_earthdistance_sql(*args)
+            else:
+                strategy, (query, query_args) = 'haversine', self._nearby_jobs_haversine_sql(*args)
+
+            records = self.iter_records(query, *query_args, prefetch=min(limit, 64))
+            try:
+                # A missing column/extension surfaces when the cursor opens,
+                # before anything has been yielded, so it is safe to retry
+                try:
+                    record = await records.__anext__()
+                except StopAsyncIteration:
+                    return
+                except (asyncpg.UndefinedColumnError, asyncpg.UndefinedFunctionError, asyncpg.UndefinedObjectError):
+                    if strategy == 'haversine':
+                        raise
+                    self._disable_nearby_strategy(strategy)
+                    continue
+
+                yield dict(record)
+                async for record in records:
+                    yield dict(record)
+                return
+            finally:
+                # Release the connection even if our caller stops early
+                await records.aclose()
+
+    def _disable_nearby_strategy(self, strategy: str) -> None:
+        """Stop trying a spatial index the database turned out not to have"""
+        if strategy == 'postgis':
+            logger.warning("⚠️ geography column/PostGIS not available - trying earthdistance")
+            self._postgis_available = False
+        else:
+            logger.warning("⚠️ earth_loc column/earthdistance not available - using Haversine scan")
+            self._earthdistance_available = False
+
+    def _nearby_jobs_postgis_sql(self, where_clause: str, params: list, rate_column: str,
+                                 center_lat: float, center_lon: float,
+                                 radius_miles: float, limit: int) -> Tuple[str, list]:
+        """Indexed radius search on the geography column (pgSqlUpdates/JobGeography)"""
+        n = len(params)
+        # Spelled out inline (not joined in) so the planner can drive
+        # the KNN ORDER BY from the GiST index
+        center = f"ST_SetSRID(ST_MakePoint(${n + 1}, ${n + 2}), 4326)::geography"
+        query = f"""
+            SELECT
+                {NEARBY_JOB_COLUMNS},
+                "{rate_column}" as rate,
+                ST_Distance(geog, {center}) / {METERS_PER_MILE} AS distance_miles
+            FROM vmsrawscrape_prod
+            WHERE {where_clause}
+                AND ST_DWithin(geog, {center}, ${n + 3})
+            ORDER BY geog <-> {center}
+            LIMIT ${n + 4}
+        """
+        return query, params + [center_lon, center_lat, radius_miles * METERS_PER_MILE, limit]
 
-            # PostgreSQL query using the Haversine formula directly in SQL for efficiency
-            # This calculates distance in the database rather than in Python
-            query = f"""
+    async def find_nearby_jobs_many(
+        self,
+        centers: List[Tuple[float, float]],
+        radius_miles: float = 50,
+        specialty: str = None,
+        rate_type: str = "billRate",
+        min_rate: float = None,
+        profession: str = None,
+        limit: int = 20
+    ) -> Optional[List[List[Dict[str, Any]]]]:
+        """
+        Find jobs near several locations in a single query
+
+        Args:
+            centers: List of (latitude, longitude) search centers
+            radius_miles, specialty, rate_type, min_rate, profession, limit:
+                Same as find_nearby_jobs, applied to every center
+
+        Returns:
+            One list of jobs per center (in the same order), each sorted by distance
+        """
+        try:
+            logger.debug("🔍 Finding jobs within %s miles of %d centers", radius_miles, len(centers))
+
+            where_clause, params, rate_column = self._nearby_jobs_filters(specialty, rate_type, min_rate, profession)
+
+            if self._postgis_available:
+                n = len(params)
+                center = "ST_SetSRID(ST_MakePoint(c.lon, c.lat), 4326)::geography"
+                query = f"""
+                    SELECT c.idx, j.*
+                    FROM unnest(${n + 1}::float8[], ${n + 2}::float8[]) WITH ORDINALITY AS c(lat, lon, idx)
+                    CROSS JOIN LATERAL (
+                        SELECT
+                            {NEARBY_JOB_COLUMNS},
+                            "{rate_column}" as rate,
+                            ST_Distance(geog, {center}) / {METERS_PER_MILE} AS distance_miles
+                        FROM vmsrawscrape_prod
+                        WHERE {where_clause}
+                            AND ST_DWithin(geog, {center}, ${n + 3})
+                        ORDER BY geog <-> {center}
+                        LIMIT ${n + 4}
+                    ) j
+                    ORDER BY c.idx, j.distance_miles
+                """
+                try:
+                    rows = await self.execute_query(
+                        query, *params,
+                        [lat for lat, _ in centers], [lon for _, lon in centers],
+                        radius_miles * METERS_PER_MILE, limit
+                    )
+                except (asyncpg.UndefinedColumnError, asyncpg.UndefinedFunctionError, asyncpg.UndefinedObjectError):
+                    self._disable_nearby_strategy('postgis')
+                else:
+                    results = [[] for _ in centers]
+                    for row in rows:
+                        results[row.pop('idx') - 1].append(row)
+                    return results
+
+            # Without PostGIS fall back to one radius query per center
+            return [
+                [
+                    job async for job in self._iter_nearby_jobs(
+                        where_clause, params, rate_column, lat, lon, radius_miles, limit
+                    )
+                ]
+                for lat, lon in centers
+            ]
+
+        except Exception as e:
+            logger.exception("❌ Error finding nearby jobs for multiple centers: %s", e)
+            return None
+
+    def _nearby_jobs_earthdistance_sql(self, where_clause: str, params: list, rate_column: str,
+                                       center_lat: float, center_lon: float,
+                                       radius_miles: float, limit: int) -> Tuple[str, list]:
+        """Radius search on the earth_loc cube column (pgSqlUpdates/JobEarthLocation)"""
+        n = len(params)
+        center = f"ll_to_earth(${n + 1}::float8, ${n + 2}::float8)"
+        radius = f"${n + 3}::float8"
+
+        # earth_box() @> earth_loc is the indexable (GiST) test; the box is a
+        # little larger than the circle, so the exact distance check follows
+        query = f"""
+            SELECT
+                {NEARBY_JOB_COLUMNS},
+                "{rate_column}" as rate,
+                earth_distance(earth_loc, {center}) / {METERS_PER_MILE} AS distance_miles
+            FROM vmsrawscrape_prod
+            WHERE {where_clause}
+                AND earth_box({center}, {radius}) @> earth_loc
+                AND earth_distance(earth_loc, {center}) <= {radius}
+            ORDER BY distance_miles ASC
+            LIMIT ${n + 4}
+        """
+
+        return query, params + [center_lat, center_lon, radius_miles * METERS_PER_MILE, limit]
+
+    def _nearby_jobs_haversine_sql(self, where_clause: str, params: list, rate_column: str,
+                                   center_lat: float, center_lon: float,
+                                   radius_miles: float, limit: int) -> Tuple[str, list]:
+        """Radius search computing the Haversine distance for every candidate row"""
+        # Center, radius and limit are bound, so the SQL text only varies with
+        # the optional filters and asyncpg can reuse the prepared statement.
+        # The center's trig terms are constant, so compute them once here
+        # rather than per row.
+        n = len(params)
+        cos_c, sin_c, lon_r, radius = (f"${n + i}::float8" for i in range(1, 5))
+        lim = f"${n + 5}"
+        min_lat, max_lat, min_lon, max_lon = (f"${n + i}::float8" for i in range(6, 10))
+        center_lat_r = math.radians(center_lat)
+
+        # Bounding box around the circle (~69 miles per degree of latitude,
+        # shrinking with cos(lat) for longitude). It is sargable against the
+        # (latitude, longitude) index, so only rows inside it reach the trig.
+        dlat = radius_miles / 69.0
+        dlon = radius_miles / (69.0 * max(math.cos(center_lat_r), 0.01))
+
+        # PostgreSQL query using the Haversine formula directly in SQL for efficiency
+        # This calculates distance in the database rather than in Python. The
+        # distance is computed once per candidate in the CTE and filtered on
+        # its alias, instead of repeating the formula in the WHERE clause.
+        # MATERIALIZED keeps PostgreSQL from inlining the CTE and substituting
+        # the formula back into the filter.
+        query = f"""
+            WITH candidates AS MATERIALIZED (
                 SELECT
-                    "clientName",
-                    city,
-                    state,
-                    "newSpecialty",
-                    "newProfession",
+                    {NEARBY_JOB_COLUMNS},
                     "{rate_column}" as rate,
-                    "startDate",
-                    "shiftType",
-                    vms,
-                    latitude,
-                    longitude,
                     (
                         3959 * acos(
-                            cos(radians({center_lat})) * cos(radians(latitude)) *
-                            cos(radians(longitude) - radians({center_lon})) +
-                            sin(radians({center_lat})) * sin(radians(latitude))
+                            {cos_c} * cos(radians(latitude)) *
+                            cos(radians(longitude) - {lon_r}) +
+                            {sin_c} * sin(radians(latitude))
                         )
                     ) AS distance_miles
                 FROM vmsrawscrape_prod
                 WHERE {where_clause}
-                    AND (
-                        3959 * acos(
-                            cos(radians({center_lat})) * cos(radians(latitude)) *
-                            cos(radians(longitude) - radians({center_lon})) +
-                            sin(radians({center_lat})) * sin(radians(latitude))
-                        )
-                    ) <= {radius_miles}
-                ORDER BY distance_miles ASC
-                LIMIT {limit}
-            """
-
-            results = await self.execute_query(query, *params)
-
-            if results:
-                print(f"  ✅ Found {len(results)} jobs within {radius_miles} miles")
-                for i, job in enumerate(results[:3], 1):
-                    print(f"     {i}. {job['clientName']} - {job['newSpecialty']} - {job['distance_miles']:.1f} mi - ${job['rate']:.0f}")
-            else:
-                print(f"  ⚠️ No jobs found within {radius_miles} miles")
-
-            return results
+                    AND latitude BETWEEN {min_lat} AND {max_lat}
+                    AND longitude BETWEEN {min_lon} AND {max_lon}
+            )
+            SELECT *
+            FROM candidates
+            WHERE distance_miles <= {radius}
+            ORDER BY distance_miles ASC
+            LIMIT {lim}
+        """
 
-        except Exception as e:
-            print(f"❌ Error finding nearby jobs: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+        return query, params + [
+            math.cos(center_lat_r), math.sin(center_lat_r), math.radians(center_lon), radius_miles, limit,
+            center_lat - dlat, center_lat + dlat, center_lon - dlon, center_lon + dlon
+        ]
 
     async def test_connection(self) -> bool:
         """Test database connectivity"""
@@ -1492,5 +1964,5 @@ class DatabaseService:
             result = await self.execute_one("SELECT 1 as test")
             return result is not None
         except Exception as e:
-            print(f"Connection test failed: {e}")
+            logger.error("Connection test failed: %s", e)
             return False
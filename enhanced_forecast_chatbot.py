@@ -1,6 +1,13 @@
-# Add these new Pydantic models to your main chatbot
+# Add these new models to your main chatbot
 
-class ForecastInsight(BaseModel):
+from dataclasses import dataclass
+
+# Forecast objects are built on every forecast request and never validated
+# field by field, so they are plain frozen dataclasses rather than Pydantic
+# models. ChatResponse accepts them as-is at the endpoint boundary.
+
+@dataclass(slots=True, frozen=True)
+class ForecastInsight:
     current_value: float
     forecasts: Dict[str, float]  # {"4_weeks": 85.5, "12_weeks": 88.2, etc.}
     growth_rates: Dict[str, float]  # {"4_weeks": 2.1, "12_weeks": 5.3, etc.}
@@ -10,7 +17,13 @@ class ForecastInsight(BaseModel):
     model_used: str
     target_metric: str
 
-class ForecastAnalysis(BaseModel):
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ForecastInsight':
+        """Build from extract_forecast_insights output, ignoring extra keys"""
+        return cls(**{name: data[name] for name in cls.__dataclass_fields__})
+
+@dataclass(slots=True, frozen=True)
+class ForecastAnalysis:
     forecast_insights: ForecastInsight
     business_recommendations: Dict[str, List[str]]  # Recommendations by role
     data_source: str
@@ -18,6 +31,18 @@ class ForecastAnalysis(BaseModel):
     specialty: str
     time_horizon: str
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ForecastAnalysis':
+        """Build from a generate_forecast_analysis result, ignoring extra keys"""
+        return cls(
+            forecast_insights=ForecastInsight.from_dict(data['forecast_insights']),
+            business_recommendations=data['business_recommendations'],
+            data_source=data['data_source'],
+            location=data['location'],
+            specialty=data['specialty'],
+            time_horizon=data['time_horizon']
+        )
+
 class ChatResponse(BaseModel):
     response: str
     rate_recommendation: Optional[RateRecommendation] = None
@@ -30,12 +55,288 @@ class ChatResponse(BaseModel):
 
 # Enhanced OpenAI processor methods
 
+import hashlib
+import re
+from dataclasses import fields, replace
+
+import orjson
+
+# Local pre-classifier for simple queries ("Current ICU rates in Texas",
+# "What will ED rates be in CA next quarter?"). Anything it cannot read
+# with confidence still goes to the LLM.
+
+# Specialty acronyms are matched case-sensitively so "or"/"er" in ordinary
+# text don't count; spelled-out names are case-insensitive.
+_FAST_SPECIALTIES = [
+    ("NICU", r"\bNICU\b|(?i:\bneonatal intensive care\b)"),
+    ("PICU", r"\bPICU\b|(?i:\bpediatric intensive care\b)"),
+    ("ICU", r"\bICU\b|(?i:\bintensive care\b|\bcritical care\b)"),
+    ("ED", r"\bED\b|\bER\b|(?i:\bemergency (?:department|room)\b)"),
+    ("OR", r"\bOR\b|(?i:\boperating room\b)"),
+    ("PACU", r"\bPACU\b"),
+    ("Med-Surg", r"(?i:\bmed[- ]?surg\b|\bmedical[- ]surgical\b)"),
+    ("Tele", r"(?i:\btele(?:metry)?\b)"),
+    ("Step-down", r"(?i:\bstep[- ]?down\b)"),
+    ("Cath Lab", r"(?i:\bcath(?:eterization)? lab\b)"),
+    ("L&D", r"\bL&D\b|(?i:\blabor (?:and|&) delivery\b)"),
+    ("Psych", r"(?i:\bpsych(?:iatric)?\b)"),
+    ("Float", r"(?i:\bfloat pool\b)"),
+]
+_FAST_SPECIALTY_RES = [(name, re.compile(pattern)) for name, pattern in _FAST_SPECIALTIES]
+
+_FAST_STATE_NAMES = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR", "california": "CA",
+    "colorado": "CO", "connecticut": "CT", "delaware": "DE", "florida": "FL", "georgia": "GA",
+    "hawaii": "HI", "idaho": "ID", "illinois": "IL", "indiana": "IN", "iowa": "IA",
+    "kansas": "KS", "kentucky": "KY", "louisiana": "LA", "maine": "ME", "maryland": "MD",
+    "massachusetts": "MA", "michigan": "MI", "minnesota": "MN", "mississippi": "MS",
+    "missouri": "MO", "montana": "MT", "nebraska": "NE", "nevada": "NV", "new hampshire": "NH",
+    "new jersey": "NJ", "new mexico": "NM", "new york": "NY", "north carolina": "NC",
+    "north dakota": "ND", "ohio": "OH", "oklahoma": "OK", "oregon": "OR", "pennsylvania": "PA",
+    "rhode island": "RI", "south carolina": "SC", "south dakota": "SD", "tennessee": "TN",
+    "texas": "TX", "utah": "UT", "vermont": "VT", "virginia": "VA", "washington": "WA",
+    "west virginia": "WV", "wisconsin": "WI", "wyoming": "WY",
+}
+_FAST_STATE_CODES = frozenset(_FAST_STATE_NAMES.values())
+# Only "in <state>" is accepted. Codes are matched case-sensitively so words
+# like "in or around" / "in me" aren't read as OR / ME; names are not.
+_FAST_STATE_RE = re.compile(
+    r"\b(?i:in)\s+(?:(?P<code>[A-Z]{2})\b|(?P<name>(?i:"
+    + "|".join(sorted(_FAST_STATE_NAMES, key=len, reverse=True))
+    + r"))\b)"
+)
+
+# Any other place mention ("in Austin", "for Los Angeles, CA", "Dallas, TX")
+# carries a city the pre-classifier does not extract, so it goes to the LLM.
+# Words after a preposition are a place unless they're on this short list.
+_FAST_PREPOSITION_RE = re.compile(r"\b(?i:in|for|at|around|from|across)\s+([\w&-]+)")
+_FAST_NON_PLACE_RE = re.compile(
+    r"(?i:the|a|an|this|next|coming|upcoming|\d+\w*|q[1-4]|weeks?|months?|quarters?|years?|"
+    r"national|nationwide|general|rates?|pay|travel|nurses?|nursing)$"
+)
+_FAST_ACRONYMS = frozenset({"NICU", "PICU", "ICU", "ED", "ER", "OR", "PACU", "L&D"})
+_FAST_CITY_STATE_RE = re.compile(r"\b[A-Za-z]+,\s*[A-Za-z]{2}\b")
+# What directly follows the matched state: "Washington, DC", "Kansas City",
+# "New York City" and "Virginia Beach" name a city, not the state itself
+_FAST_AFTER_STATE_RE = re.compile(
+    r"(?P<comma>,)?\s*(?:(?P<suffix>(?i:d\.?c\b\.?|city|beach|county)\b)|(?P<word>[A-Z][\w&.'-]*))"
+)
+
+_FAST_NATIONAL_RE = re.compile(r"\b(?:national(?:ly)?|nationwide)\b", re.IGNORECASE)
+
+_FAST_TEMPORAL_RE = re.compile(
+    r"\b(?:forecasts?|predict\w*|projections?|outlooks?|trends?|trending|will be|going to|heading|upcoming|"
+    r"next (?:month|quarter|year)|in \d+ (?:weeks|months)|Q[1-4]|20[2-9]\d)\b",
+    re.IGNORECASE
+)
+
+# Checked in order; the first horizon whose pattern matches wins
+_FAST_HORIZON_RES = [
+    ("26_weeks", re.compile(r"\b(?:6 months|six months|half[- ]year|26 weeks)\b", re.IGNORECASE)),
+    ("52_weeks", re.compile(r"\b(?:next year|annual|12 months|52 weeks|20[2-9]\d)\b", re.IGNORECASE)),
+    ("12_weeks", re.compile(r"\b(?:quarter|3 months|three months|Q[1-4]|12 weeks)\b", re.IGNORECASE)),
+    ("4_weeks", re.compile(r"\b(?:next month|month|4 weeks)\b", re.IGNORECASE)),
+]
+
+_FAST_RATE_RE = re.compile(r"\b(?:rates?|pay|bill)\b", re.IGNORECASE)
+
+# Signals of intents or details the pre-classifier does not handle
+_FAST_COMPLEX_RE = re.compile(
+    r"\$|\d+\s*(?:/hr|per hour)|\b(?:vendor|msp|lead|client|hospital|facility|compare|versus|vs\.?|"
+    r"near|within|miles|highest|lowest|similar|lock in|wait|should i|"
+    # Perspective clues the LLM uses to set user_perspective
+    r"compet\w*|undercut\w*|deals?|prospects?|opportunit\w*|candidates?|margins?|budget|roi|profit\w*)\b",
+    re.IGNORECASE
+)
+
+
+def _mentions_other_place(message: str) -> bool:
+    """True if the message names a location besides the state already matched (and removed)"""
+    if _FAST_CITY_STATE_RE.search(message):
+        return True
+    return any(
+        not _FAST_NON_PLACE_RE.match(word) and word not in _FAST_ACRONYMS
+        for word in _FAST_PREPOSITION_RE.findall(message)
+    )
+
+
+def _continues_place(message: str, pos: int) -> bool:
+    """True if the state matched just before pos is part of a longer place name"""
+    match = _FAST_AFTER_STATE_RE.match(message, pos)
+    if not match:
+        return False
+    if match.group('suffix') or match.group('comma'):
+        return True
+    word = match.group('word')
+    return word not in _FAST_ACRONYMS and not _FAST_NON_PLACE_RE.match(word)
+
+
+def _fast_extract(user_message: str, user_role: Optional[str] = None,
+                  conversation_history: Optional[List] = None) -> Tuple[Optional['EnhancedQueryParameters'], float]:
+    """
+    Extract parameters for simple rate/forecast questions without the LLM
+
+    Follow-ups ("What about ICU next quarter?") depend on earlier turns, so
+    any conversation history sends the message to the LLM.
+
+    Returns:
+        (parameters, confidence); parameters is None when confidence is 0
+    """
+    if conversation_history or _FAST_COMPLEX_RE.search(user_message):
+        return None, 0.0
+
+    specialties = [name for name, pattern in _FAST_SPECIALTY_RES if pattern.search(user_message)]
+    if len(specialties) != 1:
+        return None, 0.0
+
+    state = None
+    rest = user_message
+    state_match = _FAST_STATE_RE.search(user_message)
+    if state_match:
+        if state_match.group('code'):
+            state = state_match.group('code')
+            if state not in _FAST_STATE_CODES:
+                return None, 0.0
+        else:
+            state = _FAST_STATE_NAMES[state_match.group('name').lower()]
+        if _continues_place(user_message, state_match.end()):
+            return None, 0.0
+        rest = f"{user_message[:state_match.start()]} {user_message[state_match.end():]}"
+
+    if _mentions_other_place(rest):
+        return None, 0.0
+
+    is_temporal = bool(_FAST_TEMPORAL_RE.search(user_message))
+
+    # Without a state, only an explicitly national forecast is safe to assume
+    if is_temporal and (state or _FAST_NATIONAL_RE.search(user_message)):
+        forecast_horizon = next(
+            (horizon for horizon, pattern in _FAST_HORIZON_RES if pattern.search(user_message)),
+            "12_weeks"
+        )
+        parameters = EnhancedQueryParameters(
+            query_type='forecast_analysis',
+            specialty=specialties[0],
+            state=state,
+            is_temporal_query=True,
+            forecast_horizon=forecast_horizon,
+            user_perspective=user_role or 'general'
+        )
+        return parameters, 0.9
+
+    if state and _FAST_RATE_RE.search(user_message):
+        parameters = EnhancedQueryParameters(
+            query_type='rate_recommendation',
+            specialty=specialties[0],
+            state=state,
+            user_perspective=user_role or 'general'
+        )
+        return parameters, 0.9
+
+    return None, 0.0
+
+# Static head of every extraction request. The field list lives in
+# _EXTRACT_SCHEMA rather than in prose, and the prompt and examples are
+# identical on every call so OpenAI can reuse its prompt cache.
+_EXTRACT_SYSTEM_PROMPT = """You extract parameters from healthcare staffing queries covering both current market analysis and future rate forecasts. Use null for anything not mentioned.
+
+Temporal queries (is_temporal_query true, query_type forecast_analysis):
+- Future time references: "next quarter", "6 months", "next year", "2025", "Q1", "upcoming"
+- Prediction words: "will be", "forecast", "predict", "trend", "projection", "outlook", "going to"
+- Rate change questions: "rate increase", "market direction", "where are rates heading"
+- Planning context: "should I wait", "lock in rates", "budget for", "expect rates to"
+
+Forecast horizon:
+- "month", "4 weeks", "next month" -> 4_weeks
+- "quarter", "3 months", "Q1/Q2/Q3/Q4", "12 weeks" -> 12_weeks
+- "6 months", "half year", "26 weeks" -> 26_weeks
+- "year", "annual", "12 months", "2025", "52 weeks" -> 52_weeks
+
+User perspective, from context clues:
+- sales: competing, undercutting, lowest rate, winning deals, client pressure, leads, opportunities, prospects
+- recruiter: fulfillment, candidate pool, time to fill, competitive pay
+- operations: efficiency, margins, capacity, workflow
+- finance: profitability, cost analysis, budget, ROI"""
+
+_NULLABLE_STRING = {"type": ["string", "null"]}
+
+_EXTRACT_SCHEMA = {
+    "name": "query_parameters",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "query_type": {
+                "type": "string",
+                "enum": ["rate_recommendation", "vendor_info", "competitive_analysis",
+                         "lead_generation", "forecast_analysis"]
+            },
+            "specialty": {
+                **_NULLABLE_STRING,
+                "description": "ICU, ED, OR, Med-Surg, Tele, NICU, PICU, Step-down, Float, Cath Lab, PACU, L&D or Psych"
+            },
+            "state": {**_NULLABLE_STRING, "description": "Two-letter state abbreviation"},
+            "city": _NULLABLE_STRING,
+            "client_name": {**_NULLABLE_STRING, "description": "Hospital or health system name"},
+            "is_temporal_query": {"type": "boolean"},
+            "forecast_horizon": {
+                "type": ["string", "null"],
+                "enum": ["4_weeks", "12_weeks", "26_weeks", "52_weeks", None]
+            },
+            "user_perspective": {
+                "type": "string",
+                "enum": ["sales", "recruiter", "operations", "finance", "general"]
+            }
+        },
+        "required": ["query_type", "specialty", "state", "city", "client_name",
+                     "is_temporal_query", "forecast_horizon", "user_perspective"],
+        "additionalProperties": False
+    }
+}
+
+_EXTRACT_PROMPT_MESSAGES = (
+    {"role": "system", "content": _EXTRACT_SYSTEM_PROMPT},
+    {"role": "user", "content": "Extract parameters from: 'What will ICU rates be in California next quarter?'"},
+    {"role": "assistant", "content": '{"query_type": "forecast_analysis", "specialty": "ICU", "state": "CA", "city": null, "client_name": null, "is_temporal_query": true, "forecast_horizon": "12_weeks", "user_perspective": "general"}'},
+    {"role": "user", "content": "Extract parameters from: 'Should I lock in OR rates now or wait 6 months?'"},
+    {"role": "assistant", "content": '{"query_type": "forecast_analysis", "specialty": "OR", "state": null, "city": null, "client_name": null, "is_temporal_query": true, "forecast_horizon": "26_weeks", "user_perspective": "sales"}'},
+    {"role": "user", "content": "Extract parameters from: 'Rate outlook for ED positions in 2025'"},
+    {"role": "assistant", "content": '{"query_type": "forecast_analysis", "specialty": "ED", "state": null, "city": null, "client_name": null, "is_temporal_query": true, "forecast_horizon": "52_weeks", "user_perspective": "finance"}'},
+    {"role": "user", "content": "Extract parameters from: 'Current ICU rates in Texas'"},
+    {"role": "assistant", "content": '{"query_type": "rate_recommendation", "specialty": "ICU", "state": "TX", "city": null, "client_name": null, "is_temporal_query": false, "forecast_horizon": null, "user_perspective": "general"}'},
+)
+
 class EnhancedOpenAIProcessor(OpenAIProcessor):
     """Extended OpenAI processor with forecast capabilities"""
-    
-    async def extract_parameters_with_forecast(self, user_message: str, conversation_history: List = None, user_role: str = None) -> EnhancedQueryParameters:
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Extracted parameters keyed by message, role and the last two
+        # history turns; repeated questions skip the LLM round trip
+        self.extraction_cache = CacheService(default_ttl=3600, max_entries=10000)
+
+    @staticmethod
+    def _extraction_cache_key(user_message: str, conversation_history: Optional[List], user_role: Optional[str]) -> str:
+        history_tail = json.dumps((conversation_history or [])[-2:], sort_keys=True, default=str)
+        raw = f"{user_message}|{user_role or ''}|{history_tail}"
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+    async def extract_parameters_with_forecast(self, user_message: str, conversation_history: List = None,
+                                               user_role: str = None, force_refresh: bool = False) -> EnhancedQueryParameters:
         """Enhanced parameter extraction that detects forecast queries"""
-        
+
+        cache_key = self._extraction_cache_key(user_message, conversation_history, user_role)
+        if not force_refresh:
+            cached = self.extraction_cache.get(cache_key)
+            if cached is not None:
+                # Callers adjust the parameters in place, so hand out a copy
+                return replace(cached)
+
+        fast_parameters, confidence = _fast_extract(user_message, user_role, conversation_history)
+        if confidence >= 0.8:
+            self.extraction_cache.set(cache_key, replace(fast_parameters))
+            return fast_parameters
+
         # Build context from conversation history
         history_context = ""
         if conversation_history:
@@ -46,68 +347,22 @@ class EnhancedOpenAIProcessor(OpenAIProcessor):
         
         role_context = f"\nUser role: {user_role}" if user_role else ""
         
-        system_prompt = """You are a parameter extraction system for healthcare staffing queries that can handle both current market analysis AND future forecasting requests.
-
-        Extract these parameters when mentioned:
-        - specialty: ICU, ED/ER, OR, Med-Surg, Tele, NICU, PICU, Step-down, Float, Cath Lab, PACU, L&D, Psych
-        - state: Full names or abbreviations (California/CA, Texas/TX, etc.)
-        - city: Any city name mentioned
-        - hospital_name: Specific hospital or health system names
-        - hospital_type: trauma_1, trauma_2, academic, community, specialty, pediatric
-        - urgency_level: urgent/asap (≤3 days), quick (≤7 days), standard (>7 days)
-        - start_date: Any mentioned dates or timeframes
-        - current_rate: Any existing rate mentioned (e.g., "they're currently at $80/hr")
-        - query_type: 'rate_recommendation', 'vendor_info', 'competitive_analysis', 'lead_generation', 'forecast_analysis'
-        - is_temporal_query: true if asking about future rates, trends, forecasts, predictions
-        - forecast_horizon: '4_weeks', '12_weeks', '26_weeks', '52_weeks' based on timeframe mentioned
-        - user_perspective: Detect from context clues:
-          * 'sales' - mentions competing, undercutting, lowest rate, winning deals, client pressure, leads, opportunities, prospects
-          * 'recruiter' - mentions fulfillment, candidate pool, time to fill, competitive pay
-          * 'operations' - mentions efficiency, margins, capacity, workflow
-          * 'finance' - mentions profitability, cost analysis, budget, ROI
-
-        TEMPORAL QUERY DETECTION:
-        Look for these patterns to identify forecast requests:
-        - Future time references: "next quarter", "6 months", "next year", "2025", "Q1", "upcoming"
-        - Prediction words: "will be", "forecast", "predict", "trend", "projection", "outlook", "going to"
-        - Rate change questions: "rate increase", "market direction", "where are rates heading"
-        - Planning context: "should I wait", "lock in rates", "budget for", "expect rates to"
-
-        TIME HORIZON MAPPING:
-        - "month", "4 weeks", "next month" → "4_weeks"
-        - "quarter", "3 months", "Q1/Q2/Q3/Q4", "12 weeks" → "12_weeks"  
-        - "6 months", "half year", "26 weeks" → "26_weeks"
-        - "year", "annual", "12 months", "2025", "52 weeks" → "52_weeks"
-
-        Return JSON only with extracted parameters. Use null for missing values.
-        
-        Examples:
-        "What will ICU rates be in California next quarter?"
-        → {"specialty": "ICU", "state": "CA", "query_type": "forecast_analysis", "is_temporal_query": true, "forecast_horizon": "12_weeks", "user_perspective": "general"}
-        
-        "Should I lock in OR rates now or wait 6 months?"
-        → {"specialty": "OR", "query_type": "forecast_analysis", "is_temporal_query": true, "forecast_horizon": "26_weeks", "user_perspective": "sales"}
-        
-        "Rate outlook for ED positions in 2025"
-        → {"specialty": "ED", "query_type": "forecast_analysis", "is_temporal_query": true, "forecast_horizon": "52_weeks", "user_perspective": "finance"}
-        
-        "Current ICU rates in Texas" (NOT temporal)
-        → {"specialty": "ICU", "state": "TX", "query_type": "rate_recommendation", "is_temporal_query": false, "user_perspective": "general"}
-        """
-        
         try:
             response = await self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    *_EXTRACT_PROMPT_MESSAGES,
                     {"role": "user", "content": f"Extract parameters from: '{user_message}'{history_context}{role_context}"}
                 ],
                 temperature=0.1,
-                max_tokens=500
+                max_tokens=500,
+                response_format={"type": "json_schema", "json_schema": _EXTRACT_SCHEMA}
             )
             
             extracted = json.loads(response.choices[0].message.content)
-            return EnhancedQueryParameters(**{k: v for k, v in extracted.items() if v is not None})
+            parameters = EnhancedQueryParameters(**{k: v for k, v in extracted.items() if v is not None})
+            self.extraction_cache.set(cache_key, replace(parameters))
+            return parameters
             
         except Exception as e:
             print(f"OpenAI extraction error: {e}")
@@ -118,8 +373,21 @@ class EnhancedOpenAIProcessor(OpenAIProcessor):
             )
 
     async def generate_forecast_response(self, forecast_data: Dict[str, Any], user_message: str, 
-                                       parameters: EnhancedQueryParameters) -> str:
+                                       parameters: EnhancedQueryParameters,
+                                       compact_parameters: Optional[Dict[str, Any]] = None) -> str:
         """Generate natural language response for forecast analysis"""
+        chunks = []
+        async for chunk in self.stream_forecast_response(forecast_data, user_message, parameters,
+                                                         compact_parameters):
+            chunks.append(chunk)
+        return "".join(chunks)
+
+    async def stream_forecast_response(self, forecast_data: Dict[str, Any], user_message: str,
+                                       parameters: EnhancedQueryParameters,
+                                       compact_parameters: Optional[Dict[str, Any]] = None) -> AsyncGenerator[str, None]:
+        """Stream the forecast response text as the model generates it"""
+        if compact_parameters is None:
+            compact_parameters = parameters.to_compact_dict()
         
         # Detect primary perspective if not explicitly set
         primary_perspective = parameters.user_perspective or 'general'
@@ -178,9 +446,10 @@ class EnhancedOpenAIProcessor(OpenAIProcessor):
         # Prepare comprehensive forecast context
         data_context = f"Query: {user_message}\n"
         data_context += f"User perspective: {primary_perspective}\n"
-        data_context += f"Extracted parameters: {parameters.__dict__}\n"
-        data_context += f"Forecast analysis: {json.dumps(forecast_data, indent=2, default=str)}"
+        data_context += f"Extracted parameters: {compact_parameters}\n"
+        data_context += f"Forecast analysis: {orjson.dumps(forecast_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode()}"
         
+        streamed_any = False
         try:
             response = await self.client.chat.completions.create(
                 model="gpt-4o",
@@ -189,14 +458,24 @@ class EnhancedOpenAIProcessor(OpenAIProcessor):
                     {"role": "user", "content": data_context}
                 ],
                 temperature=0.7,
-                max_tokens=1200
+                max_tokens=1200,
+                stream=True
             )
             
-            return response.choices[0].message.content
+            async for chunk in response:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    streamed_any = True
+                    yield content
             
         except Exception as e:
             print(f"OpenAI forecast response generation error: {e}")
-            return self._fallback_forecast_response(forecast_data, parameters)
+            # Text already sent can't be taken back, so only fall back when
+            # the model produced nothing
+            if not streamed_any:
+                yield self._fallback_forecast_response(forecast_data, parameters)
 
     def _fallback_forecast_response(self, forecast_data: Dict[str, Any], parameters: EnhancedQueryParameters) -> str:
         """Fallback response if OpenAI fails for forecasts"""
@@ -228,30 +507,60 @@ class EnhancedOpenAIProcessor(OpenAIProcessor):
         return response
 
 # Enhanced query parameters class
-from dataclasses import dataclass
 
 @dataclass
 class EnhancedQueryParameters(QueryParameters):
     is_temporal_query: bool = False
     forecast_horizon: Optional[str] = None  # "4_weeks", "12_weeks", "26_weeks", "52_weeks"
 
+    def to_compact_dict(self) -> Dict[str, Any]:
+        """Fields that are set, for API responses and LLM prompts"""
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if getattr(self, f.name) is not None
+        }
+
+# Services shared by every request, created once at startup so the
+# forecasting session and OpenAI client keep their connections alive
+
+forecasting_service: Optional[ForecastingService] = None
+forecast_integration: Optional[ChatbotForecastIntegration] = None
+enhanced_openai_processor: Optional[EnhancedOpenAIProcessor] = None
+
+@app.on_event("startup")
+async def init_forecast_services():
+    """Initialize forecasting services on startup"""
+    global forecasting_service, forecast_integration, enhanced_openai_processor
+
+    forecasting_service = ForecastingService(os.getenv("FORECASTING_URL", "http://localhost:8002"))
+    forecast_integration = ChatbotForecastIntegration(forecasting_service)
+    enhanced_openai_processor = EnhancedOpenAIProcessor(openai_client)
+
+@app.on_event("shutdown")
+async def close_forecast_services():
+    """Close the forecasting session on shutdown"""
+    if forecasting_service:
+        await forecasting_service.close_session()
+
 # Usage example for the enhanced chat endpoint
 
 @app.post("/chat", response_model=ChatResponse)
 async def enhanced_chat_endpoint(query: ChatQuery):
     """Enhanced chat endpoint with forecasting capabilities"""
     try:
-        # Initialize services
-        forecasting_service = ForecastingService(os.getenv("FORECASTING_URL", "http://localhost:8002"))
-        forecast_integration = ChatbotForecastIntegration(forecasting_service)
-        enhanced_openai_processor = EnhancedOpenAIProcessor(openai_client)
-        
-        # Extract parameters with forecast detection
-        parameters = await enhanced_openai_processor.extract_parameters_with_forecast(
-            query.message, 
-            query.conversation_history,
-            query.user_role
+        # Extract parameters with forecast detection. The LLM round trip does
+        # not depend on the forecasting service, so set up its session meanwhile
+        parameters, _ = await asyncio.gather(
+            enhanced_openai_processor.extract_parameters_with_forecast(
+                query.message,
+                query.conversation_history,
+                query.user_role
+            ),
+            forecasting_service.get_session()
         )
+        # Shared by the response payload and the forecast prompt
+        extracted_parameters = parameters.to_compact_dict()
         
         # Route based on query type
         if parameters.query_type == "forecast_analysis":
@@ -262,22 +571,22 @@ async def enhanced_chat_endpoint(query: ChatQuery):
                 error_response = f"I couldn't generate a forecast: {forecast_analysis_data['error']}"
                 return ChatResponse(
                     response=error_response,
-                    extracted_parameters=parameters.__dict__,
+                    extracted_parameters=extracted_parameters,
                     requires_data=False
                 )
             
             # Create forecast analysis object
-            forecast_analysis = ForecastAnalysis(**forecast_analysis_data)
+            forecast_analysis = ForecastAnalysis.from_dict(forecast_analysis_data)
             
             # Generate AI response focused on forecast insights
             ai_response = await enhanced_openai_processor.generate_forecast_response(
-                forecast_analysis_data, query.message, parameters
+                forecast_analysis_data, query.message, parameters, extracted_parameters
             )
             
             return ChatResponse(
                 response=ai_response,
                 forecast_analysis=forecast_analysis,
-                extracted_parameters=parameters.__dict__,
+                extracted_parameters=extracted_parameters,
                 requires_data=True,
                 user_role_detected=parameters.user_perspective
             )
@@ -293,7 +602,7 @@ async def enhanced_chat_endpoint(query: ChatQuery):
             return ChatResponse(
                 response=ai_response,
                 rate_recommendation=recommendation,
-                extracted_parameters=parameters.__dict__,
+                extracted_parameters=extracted_parameters,
                 requires_data=True,
                 user_role_detected=parameters.user_perspective
             )
@@ -309,7 +618,7 @@ async def enhanced_chat_endpoint(query: ChatQuery):
             return ChatResponse(
                 response=ai_response,
                 lead_analysis=lead_analysis,
-                extracted_parameters=parameters.__dict__,
+                extracted_parameters=extracted_parameters,
                 requires_data=True,
                 user_role_detected=parameters.user_perspective
             )
@@ -337,12 +646,67 @@ What type of analysis would you like?"""
             
             return ChatResponse(
                 response=general_response,
-                extracted_parameters=parameters.__dict__,
+                extracted_parameters=extracted_parameters,
                 requires_data=False
             )
-        
-        # Clean up
-        await forecasting_service.close_session()
-            
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
+
+@app.post("/chat/forecast/stream")
+async def forecast_chat_stream_endpoint(query: ChatQuery):
+    """
+    Forecast chat endpoint that streams the answer text as it is generated
+
+    Returns Server-Sent Events: 'token' events carry response text, the final
+    'complete' event carries the same ChatResponse as /chat
+    """
+    async def generate_forecast_stream() -> AsyncGenerator[str, None]:
+        try:
+            parameters, _ = await asyncio.gather(
+                enhanced_openai_processor.extract_parameters_with_forecast(
+                    query.message,
+                    query.conversation_history,
+                    query.user_role
+                ),
+                forecasting_service.get_session()
+            )
+            extracted_parameters = parameters.to_compact_dict()
+
+            if parameters.query_type != "forecast_analysis":
+                yield f"data: {orjson.dumps({'status': 'error', 'message': 'Not a forecast query; use /chat or /chat/stream'}).decode()}\n\n"
+                return
+
+            forecast_analysis_data = await forecast_integration.generate_forecast_analysis(parameters)
+
+            if "error" in forecast_analysis_data:
+                response = ChatResponse(
+                    response=f"I couldn't generate a forecast: {forecast_analysis_data['error']}",
+                    extracted_parameters=extracted_parameters,
+                    requires_data=False
+                )
+                yield f"data: {orjson.dumps({'status': 'complete', 'data': response.dict()}, default=str).decode()}\n\n"
+                return
+
+            forecast_analysis = ForecastAnalysis.from_dict(forecast_analysis_data)
+
+            chunks = []
+            async for chunk in enhanced_openai_processor.stream_forecast_response(
+                forecast_analysis_data, query.message, parameters, extracted_parameters
+            ):
+                chunks.append(chunk)
+                yield f"data: {orjson.dumps({'status': 'token', 'content': chunk}).decode()}\n\n"
+
+            response = ChatResponse(
+                response="".join(chunks),
+                forecast_analysis=forecast_analysis,
+                extracted_parameters=extracted_parameters,
+                requires_data=True,
+                user_role_detected=parameters.user_perspective
+            )
+            yield f"data: {orjson.dumps({'status': 'complete', 'data': response.dict()}, default=str).decode()}\n\n"
+
+        except Exception as e:
+            yield f"data: {orjson.dumps({'status': 'error', 'message': f'Error processing query: {str(e)}'}).decode()}\n\n"
+
+    return StreamingResponse(generate_forecast_stream(), media_type="text/event-stream")
@@ -3,7 +3,13 @@ Simple Geocoding Service for US Cities
 Provides latitude/longitude coordinates for major US cities
 """
 
-from typing import Optional, Tuple, Dict
+from bisect import bisect_left
+import functools
+import string
+from types import MappingProxyType
+from typing import Any, Optional, Tuple, Dict, List, Mapping
+
+import numpy as np
 
 # Dictionary of major US cities with their coordinates
 # Format: "city, state_abbr": (latitude, longitude)
@@ -18,7 +24,6 @@ CITY_COORDINATES: Dict[str, Tuple[float, float]] = {
 
     # New York
     "new york, ny": (40.7128, -74.0060),
-    "nyc, ny": (40.7128, -74.0060),
     "buffalo, ny": (42.8864, -78.8784),
     "rochester, ny": (43.1566, -77.6088),
     "syracuse, ny": (43.0481, -76.1474),
@@ -101,7 +106,6 @@ CITY_COORDINATES: Dict[str, Tuple[float, float]] = {
     # Missouri
     "kansas city, mo": (39.0997, -94.5786),
     "st louis, mo": (38.6270, -90.1994),
-    "st. louis, mo": (38.6270, -90.1994),
     "springfield, mo": (37.2090, -93.2923),
 
     # Wisconsin
@@ -137,7 +141,6 @@ CITY_COORDINATES: Dict[str, Tuple[float, float]] = {
     # Minnesota
     "minneapolis, mn": (44.9778, -93.2650),
     "st paul, mn": (44.9537, -93.0900),
-    "st. paul, mn": (44.9537, -93.0900),
 
     # Maryland
     "baltimore, md": (39.2904, -76.6122),
@@ -158,63 +161,173 @@ CITY_COORDINATES: Dict[str, Tuple[float, float]] = {
     "lexington, ky": (38.0406, -84.5037),
 }
 
+# Alternate city names -> the name CITY_COORDINATES uses. Periods are
+# stripped (see _NORMALIZE) before this lookup, so "St. Louis" already becomes "st louis".
+CITY_ALIASES: Dict[str, str] = {
+    "nyc": "new york",
+}
+
+# Lower-cases ASCII letters and drops periods in one str.translate() pass
+_NORMALIZE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase, ".")
+
+# CITY_COORDINATES split up for lookups: state -> city -> coordinates, and
+# city alone -> coordinates for lookups without a state. For the latter the
+# first entry wins, matching the order CITY_COORDINATES lists them in.
+CITY_BY_STATE: Dict[str, Dict[str, Tuple[float, float]]] = {}
+CITY_ONLY_INDEX: Dict[str, Tuple[float, float]] = {}
+for _key, _coords in CITY_COORDINATES.items():
+    _city, _state = _key.split(", ", 1)
+    CITY_BY_STATE.setdefault(_state, {})[_city] = _coords
+    CITY_ONLY_INDEX.setdefault(_city, _coords)
+del _key, _coords, _city, _state
+
+# The same coordinates as one (N, 2) latitude/longitude array for vectorized
+# distance math; row i belongs to CITY_KEYS[i]
+CITY_KEYS: List[str] = list(CITY_COORDINATES)
+CITY_COORDINATE_ARRAY = np.array([CITY_COORDINATES[key] for key in CITY_KEYS], dtype=np.float64)
+CITY_COORDINATE_ARRAY.setflags(write=False)
+_CITY_RADIANS = np.radians(CITY_COORDINATE_ARRAY)
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Sorted "city, state" keys, so a city-name prefix is one bisect plus a short walk
+SORTED_CITY_KEYS: List[str] = sorted(CITY_COORDINATES)
+
+
+@functools.lru_cache(maxsize=4096)
+def geocode(city: str, state: Optional[str] = None) -> Optional[Tuple[float, float]]:
+    """
+    Get latitude and longitude for a city (memoized on the raw arguments)
+
+    Args:
+        city: City name (e.g., "Cincinnati", "New York")
+        state: State abbreviation (e.g., "OH", "NY")
+
+    Returns:
+        Tuple of (latitude, longitude) or None if not found
+    """
+    if not city:
+        return None
+
+    # Fast path: callers passing already-normalized names ("austin", "tx") hit directly
+    if state:
+        state_cities = CITY_BY_STATE.get(state)
+        if state_cities:
+            coords = state_cities.get(city)
+            if coords:
+                return coords
+
+    # Normalize input
+    city_lower = city.translate(_NORMALIZE).strip()
+    city_lower = CITY_ALIASES.get(city_lower, city_lower)
+    state_lower = state.lower().strip() if state else None
+
+    # Try exact match with state
+    if state_lower:
+        state_cities = CITY_BY_STATE.get(state_lower)
+        if state_cities:
+            coords = state_cities.get(city_lower)
+            if coords:
+                return coords
+
+    # Try to find city in any state
+    return CITY_ONLY_INDEX.get(city_lower)
+
+
+@functools.lru_cache(maxsize=4096)
+def get_city_info(city: str, state: Optional[str] = None) -> Optional[Mapping[str, Any]]:
+    """
+    Get detailed city information including coordinates
+
+    Args:
+        city: City name
+        state: State abbreviation
+
+    Returns:
+        Read-only mapping with city info (built once per city/state and shared;
+        copy with dict() to modify) or None
+    """
+    coords = geocode(city, state)
+
+    if coords:
+        return MappingProxyType({
+            "city": city,
+            "state": state,
+            "latitude": coords[0],
+            "longitude": coords[1]
+        })
+
+    return None
+
 
 class GeocodingService:
-    """Simple geocoding service for US cities"""
+    """Simple geocoding service for US cities
 
-    def __init__(self):
-        self.coordinates = CITY_COORDINATES
+    Thin wrapper kept for existing callers; the lookups are the module-level
+    geocode() and get_city_info() functions.
+    """
+
+    # Shared module table; kept as an attribute for callers that read it
+    coordinates = CITY_COORDINATES
 
     def geocode(self, city: str, state: Optional[str] = None) -> Optional[Tuple[float, float]]:
+        """Same as the module-level geocode()"""
+        return geocode(city, state)
+
+    def find_cities(self, prefix: str, limit: int = 10) -> List[str]:
         """
-        Get latitude and longitude for a city
+        List known "city, state" keys whose city starts with a prefix
 
         Args:
-            city: City name (e.g., "Cincinnati", "New York")
-            state: State abbreviation (e.g., "OH", "NY")
+            prefix: Start of a city name (e.g., "san")
+            limit: Maximum number of matches to return
 
         Returns:
-            Tuple of (latitude, longitude) or None if not found
+            Matching keys in alphabetical order
         """
-        if not city:
-            return None
-
-        # Normalize input
-        city_lower = city.lower().strip()
-        state_lower = state.lower().strip() if state else None
-
-        # Try exact match with state
-        if state_lower:
-            key = f"{city_lower}, {state_lower}"
-            if key in self.coordinates:
-                return self.coordinates[key]
-
-        # Try to find city in any state
-        for key, coords in self.coordinates.items():
-            if key.startswith(f"{city_lower},"):
-                return coords
-
-        return None
-
-    def get_city_info(self, city: str, state: Optional[str] = None) -> Optional[Dict[str, any]]:
+        prefix = prefix.translate(_NORMALIZE).strip()
+        if not prefix:
+            return []
+
+        matches = []
+        index = bisect_left(SORTED_CITY_KEYS, prefix)
+        while index < len(SORTED_CITY_KEYS) and len(matches) < limit:
+            key = SORTED_CITY_KEYS[index]
+            if not key.startswith(prefix):
+                break
+            matches.append(key)
+            index += 1
+        return matches
+
+    def nearest(self, latitude: float, longitude: float, radius_km: Optional[float] = None,
+                limit: int = 5) -> List[Tuple[str, float]]:
         """
-        Get detailed city information including coordinates
+        Find the known cities closest to a point
 
         Args:
-            city: City name
-            state: State abbreviation
+            latitude: Latitude of the point
+            longitude: Longitude of the point
+            radius_km: Only include cities within this distance (optional)
+            limit: Maximum number of cities to return
 
         Returns:
-            Dictionary with city info or None
+            List of ("city, state", distance_km), closest first
         """
-        coords = self.geocode(city, state)
+        lat = np.radians(latitude)
+        lon = np.radians(longitude)
+        city_lat = _CITY_RADIANS[:, 0]
 
-        if coords:
-            return {
-                "city": city,
-                "state": state,
-                "latitude": coords[0],
-                "longitude": coords[1]
-            }
+        # Haversine distance to every city in one pass
+        a = (np.sin((city_lat - lat) / 2) ** 2
+             + np.cos(lat) * np.cos(city_lat) * np.sin((_CITY_RADIANS[:, 1] - lon) / 2) ** 2)
+        distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
 
-        return None
+        rows = np.argsort(distances, kind="stable")[:limit]
+        if radius_km is not None:
+            rows = rows[distances[rows] <= radius_km]
+
+        return [(CITY_KEYS[row], round(float(distances[row]), 2)) for row in rows]
+
+    def get_city_info(self, city: str, state: Optional[str] = None) -> Optional[Mapping[str, Any]]:
+        """Same as the module-level get_city_info()"""
+        return get_city_info(city, state)
@@ -1,16 +1,16 @@
 import os
 from dotenv import load_dotenv
 
-print("Loading Gunicorn configuration...")
-# Load environment variables
-load_dotenv()
+# Load environment variables from the .env next to this file (no directory walk)
+load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"), override=False)
+_env = os.environ
 
-bind = f"{os.getenv('HOST', '127.0.0.1')}:{os.getenv('PORT', '9000')}"
-workers = int(os.getenv('WORKERS', '2'))  # Reduced for ASGI workers
+bind = f"{_env.get('HOST', '127.0.0.1')}:{_env.get('PORT', '9000')}"
+workers = int(_env.get('WORKERS', '2'))  # Reduced for ASGI workers
 worker_class = "uvicorn.workers.UvicornWorker"
-timeout = int(os.getenv('TIMEOUT', '600'))
-accesslog = os.getenv('ACCESS_LOG', 'access.log')
-errorlog = os.getenv('ERROR_LOG', 'error.log')
+timeout = int(_env.get('TIMEOUT', '600'))
+accesslog = _env.get('ACCESS_LOG', 'access.log')
+errorlog = _env.get('ERROR_LOG', 'error.log')
 capture_output = True
-loglevel = os.getenv('LOG_LEVEL', 'info').lower()
+loglevel = _env.get('LOG_LEVEL', 'info').lower()
 preload_app = True
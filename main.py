@@ -8,16 +8,24 @@ import sys
 from typing import Optional, List, Dict, Any, AsyncGenerator, Union
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 import asyncio
 import json
+import logging
 import time
 
 # Load environment variables (override=True ensures .env takes precedence)
 load_dotenv(override=True)
 
+# Service modules log through `logging`; DEBUG output (query tracing) is
+# skipped unless LOG_LEVEL=DEBUG is set
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+
 # Import local modules
 from database_service import DatabaseService
 from openai_processor import OpenAIProcessor, QueryParameters
@@ -28,7 +36,8 @@ from cache_service import CacheService
 app = FastAPI(
     title="Healthcare Staffing Intelligence Chatbot",
     description="AI-powered chatbot for healthcare staffing with forecasting capabilities",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS configuration
@@ -115,6 +124,7 @@ class StatusUpdate(BaseModel):
 db_service: Optional[DatabaseService] = None
 openai_processor: Optional[OpenAIProcessor] = None
 forecasting_service: Optional[ForecastingService] = None
+forecast_integration: Optional[ChatbotForecastIntegration] = None
 cache_service: Optional[CacheService] = None
 
 # Nurse License Compact States
@@ -127,7 +137,7 @@ COMPACT_STATES = [
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
-    global db_service, openai_processor, forecasting_service, cache_service
+    global db_service, openai_processor, forecasting_service, forecast_integration, cache_service
 
     print("🚀 Starting AVA - AI Virtual Assistant...")
     print("   Your Healthcare Staffing Intelligence Partner")
@@ -143,7 +153,9 @@ async def startup_event():
             user=os.getenv("DB_USER"),
             password=os.getenv("DB_PASSWORD"),
             database=os.getenv("DB_NAME"),
-            port=int(os.getenv("DB_PORT", "5432"))
+            port=int(os.getenv("DB_PORT", "5432")),
+            pool_min_size=int(os.getenv("DB_POOL_MIN_SIZE", "4")),
+            pool_max_size=int(os.getenv("DB_POOL_MAX_SIZE", "20"))
         )
         await db_service.connect()
         print("✅ Database connection established")
@@ -162,6 +174,7 @@ async def startup_event():
     # Initialize forecasting service
     forecasting_url = os.getenv("FORECASTING_URL", "http://localhost:8001")
     forecasting_service = ForecastingService(forecasting_base_url=forecasting_url)
+    forecast_integration = ChatbotForecastIntegration(forecasting_service)
     print(f"✅ Forecasting service configured: {forecasting_url}")
 
     print("\n🎯 Server ready! Available endpoints:")
@@ -625,7 +638,6 @@ async def chat_endpoint(query: ChatQuery):
                 elif not parameters.rate_type:
                     parameters.rate_type = "bill_rate"
 
-            forecast_integration = ChatbotForecastIntegration(forecasting_service)
             # Use the forecast model from the query, default to prophet
             selected_model = query.forecast_model or "prophet"
             forecast_data = await forecast_integration.generate_forecast_analysis(parameters, model=selected_model)
@@ -737,7 +749,6 @@ async def chat_endpoint(query: ChatQuery):
                 )
 
             # Get forecast rates
-            forecast_integration = ChatbotForecastIntegration(forecasting_service)
             # Use the forecast model from the query, default to prophet
             selected_model = query.forecast_model or "prophet"
             forecast_data = await forecast_integration.generate_forecast_analysis(parameters, model=selected_model)
@@ -1599,10 +1610,9 @@ Consider conducting candidate surveys to understand why offers are being decline
                 )
 
             # Import geocoding service
-            from geocoding_service import GeocodingService
+            from geocoding_service import geocode
 
-            geocoder = GeocodingService()
-            coords = geocoder.geocode(parameters.city, parameters.state)
+            coords = geocode(parameters.city, parameters.state)
 
             if not coords:
                 return ChatResponse(
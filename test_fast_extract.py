@@ -0,0 +1,94 @@
+"""
+Tests for the regex pre-classifier in enhanced_forecast_chatbot.py
+
+enhanced_forecast_chatbot.py is pasted into the main chatbot and can't be
+imported on its own, so only the pre-classifier block (everything between
+its header comment and the extraction prompt) is executed here, with a
+plain stand-in for EnhancedQueryParameters.
+"""
+import os
+import re
+import unittest
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "enhanced_forecast_chatbot.py")
+
+
+def _load_fast_extract():
+    with open(SOURCE, encoding="utf-8") as f:
+        source = f.read()
+    start = source.index("# Local pre-classifier for simple queries")
+    end = source.index("# Static head of every extraction request")
+    namespace = {
+        "re": re, "List": List, "Optional": Optional, "Tuple": Tuple,
+        "EnhancedQueryParameters": lambda **kwargs: SimpleNamespace(**kwargs),
+    }
+    exec(compile(source[start:end], SOURCE, "exec"), namespace)
+    return namespace["_fast_extract"]
+
+
+_fast_extract = _load_fast_extract()
+
+
+class FastExtractTest(unittest.TestCase):
+
+    def assertDeclined(self, message, history=None):
+        self.assertEqual(_fast_extract(message, None, history), (None, 0.0), message)
+
+    def test_state_followed_by_city_name(self):
+        for message in [
+            "ICU rates in Washington, DC",
+            "ICU rates in Washington DC",
+            "ICU rates in Washington D.C.",
+            "ICU rates in Kansas City",
+            "ICU rates in New York City",
+            "ICU pay in Virginia Beach",
+        ]:
+            self.assertDeclined(message)
+
+    def test_other_place_mentioned(self):
+        for message in [
+            "What will ICU rates be in Austin next quarter?",
+            "ICU rates in Dallas, TX next quarter",
+            "ICU forecast for Los Angeles, CA",
+        ]:
+            self.assertDeclined(message)
+
+    def test_lowercase_words_are_not_state_codes(self):
+        self.assertDeclined("ICU rates in or around Seattle next year")
+        self.assertDeclined("ICU rates in me")
+
+    def test_follow_ups_go_to_llm(self):
+        self.assertDeclined("What about ICU next quarter?")
+        self.assertDeclined("ICU rates in Texas", [{"role": "user", "content": "ED rates in Ohio"}])
+
+    def test_forecast_without_state_or_national_scope(self):
+        self.assertDeclined("ICU forecast next year")
+
+    def test_state_rate_query(self):
+        parameters, confidence = _fast_extract("Current ICU rates in Texas")
+        self.assertEqual(confidence, 0.9)
+        self.assertEqual((parameters.query_type, parameters.specialty, parameters.state),
+                         ('rate_recommendation', 'ICU', 'TX'))
+
+    def test_state_forecast(self):
+        parameters, confidence = _fast_extract("What will ED rates be in CA next quarter?")
+        self.assertEqual(confidence, 0.9)
+        self.assertEqual((parameters.query_type, parameters.state, parameters.forecast_horizon),
+                         ('forecast_analysis', 'CA', '12_weeks'))
+
+        parameters, _ = _fast_extract("ICU rate trends in Texas Q1")
+        self.assertEqual((parameters.query_type, parameters.state), ('forecast_analysis', 'TX'))
+
+        parameters, _ = _fast_extract("Forecast for ICU in TX in 6 months")
+        self.assertEqual((parameters.state, parameters.forecast_horizon), ('TX', '26_weeks'))
+
+    def test_national_forecast(self):
+        parameters, confidence = _fast_extract("ICU national forecast for next year")
+        self.assertEqual(confidence, 0.9)
+        self.assertEqual((parameters.state, parameters.forecast_horizon), (None, '52_weeks'))
+
+
+if __name__ == "__main__":
+    unittest.main()